@@ -0,0 +1,41 @@
+"""Scratch database and user seeding shared by the benchmarks.
+
+Nothing from ``src`` is imported at module level, so ``scratch_database``
+can run before ``src.database`` reads ``DATABASE_URL``.
+"""
+import os
+import tempfile
+from typing import Callable
+
+
+def scratch_database(name: str) -> str:
+    """Point the app at a throwaway SQLite file unless ``DATABASE_URL`` is set.
+
+    Call before importing ``src.database``; returns the scratch directory.
+    """
+    directory = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(directory, name)}")
+    return directory
+
+
+def user_row(i: int, **extra) -> dict:
+    return {
+        "email": f"user{i}@example.com",
+        "first_name": "User",
+        "linkedin_url": f"https://linkedin.com/in/user{i}",
+        "photo_url": f"https://cdn.example.com/{i}.jpg",
+        **extra,
+    }
+
+
+def seed_users(engine, users: int, chunk: int = 50000, extra: Callable[[int], dict] | None = None):
+    """Insert users ``0 .. users - 1``; ``extra(i)`` adds columns to row ``i``."""
+    from sqlalchemy import insert
+
+    import src.models as models
+
+    with engine.begin() as conn:
+        for start in range(0, users, chunk):
+            conn.execute(insert(models.User.__table__), [
+                user_row(i, **(extra(i) if extra else {})) for i in range(start, min(start + chunk, users))
+            ])
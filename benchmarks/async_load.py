@@ -0,0 +1,107 @@
+"""Load test of the sync and async request paths at high concurrency.
+
+Seeds a SQLite database, then for each mode starts a fresh interpreter
+with ``DB_ASYNC`` set accordingly and drives the app in-process through
+``httpx.ASGITransport`` with ``--clients`` concurrent clients issuing a mix
+of ``/user/validate`` and ``/users`` requests.
+
+In sync mode a request holds its pooled connection until the session is
+closed in the threadpool, so with far more clients than threadpool workers
+the pool runs dry and checkouts time out (reported as errors).
+
+    python -m benchmarks.async_load --clients 500 --requests 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks._seed import seed_users
+
+
+def seed(db_url: str, users: int):
+    os.environ["DATABASE_URL"] = db_url
+    from src.manage import create_all
+    from src.database import init_engines
+
+    engine = init_engines()
+    create_all(engine)
+    seed_users(engine, users, extra=lambda i: {"followers_amount": i % 5000})
+
+
+async def drive(clients: int, requests: int, users: int):
+    import httpx
+
+    from src.main import app, lifespan
+
+    latencies = []
+    errors = 0
+    rng = random.Random(1)
+
+    async def client(http):
+        nonlocal errors
+        for n in range(requests):
+            start = time.perf_counter()
+            if n % 4:
+                response = await http.post("/user/validate", json={"email": f"user{rng.randrange(users * 2)}@example.com"})
+            else:
+                response = await http.get("/users", params={"limit": 20})
+            if response.is_success:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    # Count failed requests (e.g. pool timeouts) instead of aborting the run.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with lifespan(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    mode = "async" if os.environ.get("DB_ASYNC") == "true" else "sync"
+    print(
+        f"{mode:<6} {len(latencies) / elapsed:8.0f} req/s "
+        f"p50={latencies[len(latencies) // 2] * 1000:7.1f}ms "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1000:7.1f}ms "
+        f"errors={errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5, help="requests per client")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--run", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        asyncio.run(drive(args.clients, args.requests, args.users))
+        return
+
+    tmp = tempfile.mkdtemp()
+    db_url = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+    seed(db_url, args.users)
+    for mode in ("sync", "async"):
+        env = dict(
+            os.environ,
+            DATABASE_URL=db_url,
+            DB_ASYNC="true" if mode == "async" else "false",
+            ENRICH_WORKERS="0",
+            ENRICH_QUEUE_PATH=os.path.join(tmp, "jobs.db"),
+        )
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.async_load", "--run", mode,
+             "--clients", str(args.clients), "--requests", str(args.requests), "--users", str(args.users)],
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
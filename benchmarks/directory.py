@@ -0,0 +1,112 @@
+"""Directory listing benchmark: keyset vs OFFSET pagination on SQLite.
+
+Seeds ``--users`` users (with jobs and education) and times fetching a page
+at increasing depths, once by keyset cursor (``list_users``) and once by
+OFFSET over the same query. Also reports statements per page, which stays
+constant thanks to ``selectinload``.
+
+    python -m benchmarks.directory --users 100000 --limit 20
+"""
+import argparse
+import random
+import time
+
+from benchmarks._seed import scratch_database, user_row
+
+scratch_database("directory.db")
+
+from sqlalchemy import event, insert
+
+import src.models as models
+from src.database import SessionLocal, init_engines
+from src.manage import create_all
+from src.users.crud import list_users, users_query
+
+
+engine = init_engines()
+create_all(engine)
+
+
+def seed(users: int, chunk: int = 20000):
+    rng = random.Random(9)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Round.__table__), [{"id": 1, "stage": "Seed"}, {"id": 2, "stage": "Series A"}])
+        for start in range(0, users, chunk):
+            ids = range(start + 1, min(start + chunk, users) + 1)
+            conn.execute(insert(models.User.__table__), [
+                user_row(
+                    i,
+                    id=i,
+                    location=rng.choice(["Bogotá", "Medellín", "Lima"]),
+                    seeking_capital=rng.random() < 0.3,
+                    followers_amount=rng.randint(0, 20000),
+                    round_id=rng.choice([1, 2, None]),
+                )
+                for i in ids
+            ])
+            conn.execute(insert(models.Job.__table__), [
+                {
+                    "user_id": i,
+                    "name": f"Company {i}-{n}",
+                    "website_url": "",
+                    "url_logo": "",
+                    "amount_employees": "",
+                    "country": "CO",
+                    "industry": rng.choice(["Fintech", "Healthtech", "SaaS"]),
+                    "linkedin_url": "",
+                    "current": n == 0,
+                    "role": "Founder",
+                }
+                for i in ids for n in range(2)
+            ])
+            conn.execute(insert(models.Education.__table__), [
+                {"user_id": i, "degree_name": "BSc", "school_name": "School", "url_school_logo": "", "linkedin_url": ""}
+                for i in ids
+            ])
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed(args.users)
+    print(f"seeded {args.users} users in {time.perf_counter() - start:.1f}s")
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+    pages = args.users // args.limit
+    db = SessionLocal()
+    try:
+        for page in (1, 10, 100, 1000, pages // 2, pages - 1):
+            offset = page * args.limit
+            boundary = db.scalars(users_query().offset(offset - 1).limit(1)).first() if offset else None
+            after = (boundary.followers_amount, boundary.id) if boundary else None
+
+            statements.clear()
+            keyset = timed(lambda: list_users(db, args.limit, after))
+            per_page = len(statements) // 5
+            offset_time = timed(lambda: list(db.scalars(users_query().offset(offset).limit(args.limit))))
+            print(
+                f"page {page:>6}  keyset={keyset * 1000:7.2f}ms  offset={offset_time * 1000:8.2f}ms  "
+                f"statements/page={per_page}"
+            )
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
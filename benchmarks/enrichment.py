@@ -0,0 +1,136 @@
+"""Enrichment latency benchmark against a local ReverseContact stub.
+
+Replays a burst of signups (with the duplicate and retried emails real
+traffic has) through the old blocking ``requests`` lookup and through
+``EnrichmentClient``, reporting p50/p99 latency and upstream calls per 1k
+signups.
+
+    python -m benchmarks.enrichment --signups 2000 --latency-ms 40
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from src.users.linkedin_data import EnrichmentClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.04
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.hits += 1
+        time.sleep(self.latency)
+        email = parse_qs(urlparse(self.path).query)["email"][0]
+        if email.startswith("unknown"):
+            body, code = {"success": False, "error": "not found"}, 404
+        else:
+            body, code = {"success": True, "email": email, "person": {"firstName": "Stub"}}, 200
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def start_stub(latency: float):
+    StubHandler.latency = latency
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/enrichment"
+
+
+def signup_emails(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    unique = [f"founder{i}@example.com" for i in range(int(n * 0.6))]
+    unique += [f"unknown{i}@example.com" for i in range(int(n * 0.1))]
+    emails = [rng.choice(unique) for _ in range(n)]
+    # Double submits and casing differences from the signup form.
+    return [e.upper() if rng.random() < 0.1 else e for e in emails]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run_blocking(url: str, emails: list[str], concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def lookup(email):
+        response = requests.request("GET", url, params={"apikey": "bench", "email": email})
+        return json.loads(response.text)
+
+    async def one(email):
+        async with semaphore:
+            start = time.perf_counter()
+            await asyncio.to_thread(lookup, email)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(one(e) for e in emails))
+
+
+async def run_client(url: str, emails: list[str], concurrency: int) -> list[float]:
+    client = EnrichmentClient(url, "bench", max_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(email):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.get(email)
+            return time.perf_counter() - start
+
+    try:
+        return await asyncio.gather(*(one(e) for e in emails))
+    finally:
+        await client.aclose()
+
+
+def report(name: str, samples: list[float], upstream: int, signups: int):
+    print(
+        f"{name:<10} p50={percentile(samples, 0.50) * 1000:7.1f}ms "
+        f"p99={percentile(samples, 0.99) * 1000:7.1f}ms "
+        f"mean={statistics.mean(samples) * 1000:7.1f}ms "
+        f"upstream/1k={upstream * 1000 / signups:7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    args = parser.parse_args()
+
+    server, url = start_stub(args.latency_ms / 1000)
+    emails = signup_emails(args.signups)
+    try:
+        for name, runner in (("requests", run_blocking), ("client", run_client)):
+            StubHandler.hits = 0
+            samples = asyncio.run(runner(url, emails, args.concurrency))
+            report(name, samples, StubHandler.hits, args.signups)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
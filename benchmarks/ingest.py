@@ -0,0 +1,147 @@
+"""Ingestion throughput benchmark against SQLite.
+
+Compares per-object ``session.add`` (one commit per signup, the way an
+endpoint would naturally write it) with ``ingest_payloads`` in chunks, and
+counts the statements each approach sends to the database.
+
+    python -m benchmarks.ingest --users 5000 --chunk-size 500
+"""
+import argparse
+import random
+import time
+
+from benchmarks._seed import scratch_database
+
+scratch_database("ingest.db")
+
+from sqlalchemy import delete, event
+
+import src.models as models
+from src.database import SessionLocal, init_engines
+from src.manage import create_all
+from src.users.ingest import ingest_payloads, user_row, job_rows, education_rows, round_lookup
+
+
+engine = init_engines()
+create_all(engine)
+
+
+STAGES = ["Pre-seed", "Seed", "Series A", "Series B"]
+
+
+def make_payload(i: int, rng: random.Random) -> dict:
+    def period(start, end=None):
+        return {"start": {"year": start, "month": rng.randint(1, 12)}, "end": {"year": end} if end else None}
+
+    positions = [
+        {
+            "companyName": f"Company {i}-{n}",
+            "title": "Founder" if n == 0 else "Engineer",
+            "linkedInUrl": f"https://linkedin.com/company/{i}-{n}",
+            "startEndDate": period(2020 - n * 2, None if n == 0 else 2021 - n * 2),
+        }
+        for n in range(rng.randint(2, 6))
+    ]
+    schools = [
+        {
+            "schoolName": f"School {n}",
+            "degreeName": "BSc",
+            "fieldOfStudy": "Economics",
+            "startEndDate": period(2005 + n, 2009 + n),
+        }
+        for n in range(rng.randint(1, 3))
+    ]
+    return {
+        "email": f"user{i}@example.com",
+        "stage": rng.choice(STAGES),
+        "person": {
+            "firstName": "User",
+            "lastName": str(i),
+            "linkedInUrl": f"https://linkedin.com/in/user{i}",
+            "photoUrl": f"https://cdn.example.com/{i}.jpg",
+            "location": "Bogotá",
+            "followerCount": rng.randint(0, 50000),
+            "positions": {"positionHistory": positions},
+            "schools": {"educationHistory": schools},
+        },
+        "company": {"name": f"Company {i}-0", "industry": "Fintech", "websiteUrl": "https://example.com"},
+    }
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self)
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def reset_tables():
+    with engine.begin() as conn:
+        for table in (models.Job, models.Education, models.User, models.Round):
+            conn.execute(delete(table))
+    round_lookup.reset()
+
+
+def per_object(payloads: list[dict]):
+    db = SessionLocal()
+    try:
+        for payload in payloads:
+            row = user_row(payload)
+            stage = db.query(models.Round).filter(models.Round.stage == payload["stage"]).first()
+            if stage is None:
+                stage = models.Round(stage=payload["stage"])
+                db.add(stage)
+            db_user = models.User(**row, stage_round=stage)
+            db.add(db_user)
+            for job in job_rows(payload):
+                db.add(models.Job(**job, user=db_user))
+            for education in education_rows(payload):
+                db.add(models.Education(**education, user=db_user))
+            db.commit()
+    finally:
+        db.close()
+
+
+def bulk(payloads: list[dict], chunk_size: int):
+    db = SessionLocal()
+    try:
+        for start in range(0, len(payloads), chunk_size):
+            ingest_payloads(db, payloads[start:start + chunk_size])
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    payloads = [make_payload(i, rng) for i in range(args.users)]
+    child_rows = sum(len(job_rows(p)) + len(education_rows(p)) for p in payloads)
+    total_rows = args.users + child_rows
+    counter = StatementCounter()
+
+    runs = (
+        ("per-object", lambda: per_object(payloads)),
+        ("bulk", lambda: bulk(payloads, args.chunk_size)),
+        ("bulk-upsert", lambda: bulk(payloads, args.chunk_size)),
+    )
+    for name, run in runs:
+        if name != "bulk-upsert":
+            reset_tables()
+        counter.count = 0
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<12} {total_rows / elapsed:10.0f} rows/s "
+            f"{elapsed:7.2f}s statements={counter.count}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Enrichment queue benchmarks: enqueue throughput and backlog drain.
+
+For each backend, times enqueuing a burst of signups, then drains the
+backlog with ``EnrichmentWorkers`` using a stub handler that sleeps for the
+simulated ReverseContact latency. The SQLite run also "restarts" halfway
+through the drain to show queued work is picked up by a new process.
+
+    python -m benchmarks.jobs --jobs 2000 --workers 16 --rate 200
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks._seed import scratch_database
+
+TMP = scratch_database("app.db")
+
+from src.users.enrichment_worker import EnrichmentWorkers
+from src.users.job_queue import MemoryJobQueue, SQLiteJobQueue, DONE, ACTIVE_STATUSES
+
+
+def stub_handler(latency: float):
+    async def handler(job):
+        await asyncio.sleep(latency)
+        return DONE, None
+    return handler
+
+
+async def backlog(queue) -> int:
+    counts = await queue.counts()
+    return sum(counts.get(status, 0) for status in ACTIVE_STATUSES)
+
+
+async def drain(queue, args, stop_after: float | None = None) -> float:
+    workers = EnrichmentWorkers(
+        queue, stub_handler(args.latency_ms / 1000), concurrency=args.workers, rate=args.rate, burst=args.workers
+    )
+    start = time.perf_counter()
+    await workers.start()
+    try:
+        while await backlog(queue):
+            if stop_after is not None and time.perf_counter() - start > stop_after:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await workers.stop()
+    return time.perf_counter() - start
+
+
+async def run(name: str, make_queue, args):
+    queue = make_queue()
+    start = time.perf_counter()
+    for i in range(args.jobs):
+        await queue.put(f"signup{i}@example.com")
+    enqueue = time.perf_counter() - start
+
+    if name == "sqlite":
+        first = await drain(queue, args, stop_after=args.jobs / args.rate / 2)
+        left = await backlog(queue)
+        queue.close()
+        queue = make_queue()
+        elapsed = first + await drain(queue, args)
+        restart = f" restarted with {left} queued"
+    else:
+        elapsed = await drain(queue, args)
+        restart = ""
+
+    counts = await queue.counts()
+    queue.close()
+    print(
+        f"{name:<7} enqueue={args.jobs / enqueue:8.0f} jobs/s "
+        f"drain={elapsed:6.2f}s ({counts.get(DONE, 0) / elapsed:6.0f} jobs/s){restart}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=200, help="upstream calls per second")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(TMP, "jobs.db")
+    backends = (("memory", MemoryJobQueue), ("sqlite", lambda: SQLiteJobQueue(path, poll_interval=0.05)))
+    for name, make_queue in backends:
+        asyncio.run(run(name, make_queue, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Membership filter benchmark on a large SQLite user table.
+
+Seeds ``--users`` rows, builds the Bloom filter from ``user.email`` and
+replays validation lookups (mostly unregistered emails, like real
+``/user/validate`` traffic) with and without the filter. Reports
+lookups/sec, counters and the memory footprint compared to a plain set.
+
+    python -m benchmarks.membership --users 1000000 --lookups 200000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmarks._seed import scratch_database, seed_users
+
+scratch_database("membership.db")
+
+from src.database import SessionLocal, init_engines
+from src.manage import create_all
+from src.users.crud import email_exists
+from src.users.membership import EmailMembership
+
+
+engine = init_engines()
+create_all(engine)
+
+
+def set_footprint(users: int) -> int:
+    tracemalloc.start()
+    emails = {f"user{i}@example.com" for i in range(users)}
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del emails
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--hit-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed_users(engine, args.users)
+    print(f"seeded {args.users} users in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(5)
+    emails = [
+        f"user{rng.randrange(args.users)}@example.com" if rng.random() < args.hit_ratio else f"lead{i}@example.com"
+        for i in range(args.lookups)
+    ]
+
+    db = SessionLocal()
+    try:
+        for name, enabled in (("db-only", False), ("filter", True)):
+            layer = EmailMembership(enabled=enabled)
+            start = time.perf_counter()
+            layer.rebuild(db)
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for email in emails:
+                layer.lookup(email, lambda key: email_exists(db, key))
+            elapsed = time.perf_counter() - start
+
+            stats = layer.stats()
+            print(
+                f"{name:<8} {args.lookups / elapsed:10.0f} lookups/s build={build:5.1f}s "
+                f"filter={stats['filter_bytes'] / 2 ** 20:6.2f}MiB db_lookups={stats['db_lookups']} "
+                f"negatives={stats['filter_negatives']} false_positives={stats['false_positives']} "
+                f"lru_hits={stats['lru_hits']}"
+            )
+    finally:
+        db.close()
+
+    print(f"plain set of {args.users} emails: {set_footprint(args.users) / 2 ** 20:.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Throughput cost of the request instrumentation in ``src.metrics``.
+
+Seeds a SQLite database, then for each mode starts a fresh interpreter and
+drives the async request path in-process through ``httpx.ASGITransport``
+with the same ``/user/validate`` + ``/users`` mix as ``benchmarks.async_load``:
+
+* ``off``      - ``METRICS_ENABLED=false``, no middleware or engine events
+* ``on``       - middleware, SQL event listeners and outbound timings
+* ``profiled`` - as ``on`` plus the sampling profiler hook at its default rate
+
+Modes are interleaved for ``--rounds`` rounds, each in its own process, so
+drift on the machine hits all of them alike; the best round per mode is
+compared against ``off``.
+
+End-to-end runs on a shared machine easily vary by 5-10% between rounds,
+which is more than the cost being measured, so the benchmark also times the
+instrumentation alone (middleware plus ``--queries`` SQL events around a
+no-op app) and reports it as a share of the CPU time per request at the
+``off`` throughput.
+
+    python -m benchmarks.metrics_overhead --clients 50 --requests 40 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.async_load import seed
+
+
+MODES = {
+    "off": {"METRICS_ENABLED": "false"},
+    "on": {"METRICS_ENABLED": "true", "PROFILE_SLOW_MS": "0"},
+    "profiled": {"METRICS_ENABLED": "true", "PROFILE_SLOW_MS": "50"},
+}
+
+
+async def instrumentation_cost(queries: int, iterations: int = 100000) -> float:
+    """Seconds of instrumentation per request."""
+    from src.metrics import MetricsMiddleware, _after_cursor_execute, _before_cursor_execute
+
+    class Route:
+        path = "/user/validate"
+
+    class Connection:
+        info = {}
+
+    async def app(scope, receive, send):
+        scope["route"] = Route
+        for _ in range(queries):
+            _before_cursor_execute(Connection, None, "SELECT 1", None, None, False)
+            _after_cursor_execute(Connection, None, "SELECT 1", None, None, False)
+        await send({"type": "http.response.start", "status": 200})
+
+    async def bare(scope, receive, send):
+        scope["route"] = Route
+        await send({"type": "http.response.start", "status": 200})
+
+    async def send(message):
+        pass
+
+    timings = []
+    for wrapped in (bare, MetricsMiddleware(app)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await wrapped({"type": "http", "method": "POST"}, None, send)
+        timings.append(time.perf_counter() - start)
+    return (timings[1] - timings[0]) / iterations
+
+
+async def drive(clients: int, requests: int, users: int) -> float:
+    import httpx
+
+    from src.main import app, lifespan
+
+    rng = random.Random(1)
+
+    async def client(http):
+        for n in range(requests):
+            if n % 4:
+                response = await http.post("/user/validate", json={"email": f"user{rng.randrange(users * 2)}@example.com"})
+            else:
+                response = await http.get("/users", params={"limit": 20})
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with lifespan(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await asyncio.gather(*(client(http) for _ in range(clients)))  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        return clients * requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40, help="requests per client")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2, help="SQL statements per request for the isolated cost")
+    parser.add_argument("--run", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(asyncio.run(drive(args.clients, args.requests, args.users)))
+        return
+
+    tmp = tempfile.mkdtemp()
+    db_url = f"sqlite:///{os.path.join(tmp, 'metrics.db')}"
+    seed(db_url, args.users)
+
+    best = dict.fromkeys(MODES, 0.0)
+    for _ in range(args.rounds):
+        for mode, settings in MODES.items():
+            env = dict(
+                os.environ,
+                **settings,
+                DATABASE_URL=db_url,
+                DB_ASYNC="true",
+                ENRICH_WORKERS="0",
+                ENRICH_QUEUE_PATH=os.path.join(tmp, "jobs.db"),
+                PROFILE_DIR=os.path.join(tmp, "profiles"),
+            )
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.metrics_overhead", "--run", mode,
+                 "--clients", str(args.clients), "--requests", str(args.requests), "--users", str(args.users)],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            best[mode] = max(best[mode], float(output.split()[-1]))
+
+    for mode, throughput in best.items():
+        print(f"{mode:<9} {throughput:8.0f} req/s  overhead={(1 - throughput / best['off']) * 100:5.1f}%")
+
+    cost = asyncio.run(instrumentation_cost(args.queries))
+    print(
+        f"isolated  {cost * 1e6:6.1f}us/request with {args.queries} queries "
+        f"= {cost * best['off'] * 100:4.1f}% of {1e6 / best['off']:.0f}us CPU per request"
+    )
+
+
+if __name__ == "__main__":
+    main()
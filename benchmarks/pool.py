@@ -0,0 +1,79 @@
+"""Connection pool load test against a SQLite file.
+
+Many worker threads check out a connection, run a query and hold the
+connection for a simulated network/query time, the way request handlers
+do. Each pool configuration reports throughput, checkout wait and how
+many checkouts timed out once the pool was exhausted.
+
+    python -m benchmarks.pool --threads 64 --hold-ms 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+DB_URL = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'pool.db')}"
+os.environ.setdefault("DATABASE_URL", DB_URL)
+
+from sqlalchemy import exc, text
+
+from src.database import create_db_engine
+
+
+CONFIGS = {
+    "default": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30},
+    "exhausted": {"pool_size": 5, "max_overflow": 0, "pool_timeout": 0.25},
+    "tuned": {"pool_size": 48, "max_overflow": 16, "pool_timeout": 10},
+}
+
+
+def run(url: str, config: dict, threads: int, requests_per_thread: int, hold: float):
+    engine = create_db_engine(url, pool_pre_ping=False, **config)
+    errors = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        for _ in range(requests_per_thread):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1")).scalar()
+                    time.sleep(hold)
+            except exc.TimeoutError:
+                with lock:
+                    errors += 1
+
+    pool_threads = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool_threads:
+        thread.start()
+    for thread in pool_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = engine.pool.snapshot()
+    engine.dispose()
+    completed = threads * requests_per_thread - errors
+    return completed / elapsed, stats, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=50, help="requests per thread")
+    parser.add_argument("--hold-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    for name, config in CONFIGS.items():
+        throughput, stats, errors = run(DB_URL, config, args.threads, args.requests, args.hold_ms / 1000)
+        mean_wait = stats["wait_seconds_total"] / max(stats["checkouts"], 1)
+        print(
+            f"{name:<10} {throughput:8.0f} req/s "
+            f"wait mean={mean_wait * 1000:7.1f}ms max={stats['wait_seconds_max'] * 1000:7.1f}ms "
+            f"timeouts={errors}"
+        )
+
+
+if __name__ == "__main__":
+    main()
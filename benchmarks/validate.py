@@ -0,0 +1,65 @@
+"""Email validation benchmark: per-email ORM lookups vs chunked IN queries.
+
+Seeds a SQLite database with users and checks a mixed list of registered
+and unknown emails through ``orm_row`` (one full ORM row per email, the
+original ``/user/validate`` query),
+``email_exists`` (one EXISTS per email) and ``existing_emails`` (chunked
+``SELECT email ... IN``).
+
+    python -m benchmarks.validate --users 100000 --emails 10000
+"""
+import argparse
+import random
+import time
+
+from benchmarks._seed import scratch_database, seed_users
+
+scratch_database("validate.db")
+
+import src.models as models
+from src.database import SessionLocal, init_engines
+from src.manage import create_all
+from src.users.crud import email_exists, existing_emails
+
+
+engine = init_engines()
+create_all(engine)
+
+
+def orm_row(db, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--emails", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    seed_users(engine, args.users)
+    rng = random.Random(3)
+    # Most CRM emails are not registered yet.
+    emails = [
+        f"user{rng.randrange(args.users)}@example.com" if rng.random() < 0.3 else f"lead{i}@example.com"
+        for i in range(args.emails)
+    ]
+
+    runs = (
+        ("orm_row", lambda db: {e for e in emails if orm_row(db, e)}),
+        ("exists", lambda db: {e for e in emails if email_exists(db, e)}),
+        ("bulk-in", lambda db: existing_emails(db, emails, chunk_size=args.chunk_size)),
+    )
+    for name, run in runs:
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            found = run(db)
+            elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+        print(f"{name:<10} {elapsed * 1000:9.1f}ms {args.emails / elapsed:10.0f} emails/s found={len(found)}")
+
+
+if __name__ == "__main__":
+    main()
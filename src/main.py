@@ -1,12 +1,97 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI, Response
 from.users.router import user
+from.users.jobs_router import jobs
+from.users.linkedin_data import enrichment_client
+from.users.membership import (
+    membership,
+    refresh_membership,
+    refresh_membership_periodically,
+    catch_up_membership_periodically,
+)
+from.users.job_queue import enrichment_queue
+from.users.enrichment_worker import enrichment_workers
+from.database import DB_ASYNC, init_engines, engines, pool_stats, dispose_engines
+from.metrics import METRICS_ENABLED, MetricsMiddleware, ProfiledRoute, instrument_engine, record_snapshot, render
+
+
+metrics = APIRouter(route_class=ProfiledRoute)
+
+
+@metrics.get("/metrics", tags=["metrics"], include_in_schema=False)
+async def prometheus_metrics():
+    record_snapshot(pool_stats(), membership.stats(), await enrichment_queue.counts())
+    body, content_type = render()
+    return Response(content=body, media_type=content_type)
+
+
+@metrics.get("/metrics/pool", tags=["metrics"])
+def database_pool_metrics() -> dict:
+    return pool_stats()
+
+
+@metrics.get("/metrics/membership", tags=["metrics"])
+def membership_metrics() -> dict:
+    return membership.stats()
+
+
+@metrics.get("/metrics/jobs", tags=["metrics"])
+async def enrichment_job_metrics() -> dict:
+    return await enrichment_queue.counts()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines are created per worker process here rather than at import; the
+    # schema is managed separately with ``python -m src.manage create-all``.
+    init_engines()
+    if METRICS_ENABLED:
+        for db_engine in engines():
+            instrument_engine(getattr(db_engine, "sync_engine", db_engine))
+
+    membership_tasks = []
+    if membership.enabled:
+        await refresh_membership()
+        membership_tasks = [
+            asyncio.create_task(refresh_membership_periodically()),
+            asyncio.create_task(catch_up_membership_periodically()),
+        ]
+
+    # ENRICH_WORKERS=0 runs an API-only process that just enqueues.
+    if enrichment_workers.concurrency > 0:
+        enrichment_client.require_api_key()
+        await enrichment_workers.start()
+
+    try:
+        yield
+    finally:
+        await enrichment_workers.stop()
+        enrichment_queue.close()
+        await enrichment_client.aclose()
+        for task in membership_tasks:
+            task.cancel()
+        await dispose_engines()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Fundraising School API", lifespan=lifespan)
 
+    if DB_ASYNC:
+        from.users.async_router import user as async_user
 
-app = FastAPI()
+        app.include_router(async_user)
+    else:
+        app.include_router(user)
 
-app.title = "Fundraising School API"
+    app.include_router(jobs)
+    app.include_router(metrics)
 
-app.include_router(user)
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
+    return app
 
 
+app = create_app()
@@ -0,0 +1,60 @@
+"""Schema management, run once per deploy instead of at import.
+
+    python -m src.manage create-all   # fresh database: create tables, stamp latest version
+    python -m src.manage migrate      # existing database: apply pending migrations
+    python -m src.manage check        # exit 1 on pending migrations or schema drift
+"""
+import argparse
+import sys
+
+from sqlalchemy import inspect
+
+import src.models as models
+from src import migrations
+from src.database import init_engines
+
+
+def create_all(engine=None):
+    """Create missing tables; a database that had none is stamped as current."""
+    engine = engine or init_engines()
+    with engine.begin() as conn:
+        fresh = not any(inspect(conn).has_table(table) for table in models.Base.metadata.tables)
+        models.Base.metadata.create_all(bind=conn)
+        if fresh:
+            migrations.stamp(conn)
+
+
+def migrate(engine=None) -> list[migrations.Migration]:
+    engine = engine or init_engines()
+    with engine.begin() as conn:
+        return migrations.upgrade(conn)
+
+
+def check(engine=None) -> list[str]:
+    engine = engine or init_engines()
+    with engine.connect() as conn:
+        problems = [f"pending migration {step.version}: {step.description}" for step in migrations.pending(conn)]
+        return problems + migrations.drift(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the database schema")
+    parser.add_argument("command", choices=["create-all", "migrate", "check"])
+    args = parser.parse_args()
+
+    if args.command == "create-all":
+        create_all()
+    elif args.command == "migrate":
+        for step in migrate():
+            print(f"Applied {step.version}: {step.description}")
+    else:
+        problems = check()
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+    print("Schema up to date")
+
+
+if __name__ == "__main__":
+    main()
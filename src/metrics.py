@@ -0,0 +1,281 @@
+"""Prometheus instrumentation for the API.
+
+``MetricsMiddleware`` records per-route latency, in-flight requests and
+status codes, and collects the SQL statements each request runs through
+engine events (see ``instrument_engine``), so N+1 query patterns show up in
+``db_queries_per_request``. Requests can optionally be profiled and dumped
+to disk when they are slower than ``PROFILE_SLOW_MS``; routers built with
+``route_class=ProfiledRoute`` also profile sync endpoints inside the
+threadpool thread that runs them.
+"""
+import asyncio
+import cProfile
+import functools
+import os
+import pstats
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.001"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+)
+REQUESTS_TOTAL = Counter(
+    "http_requests_total", "HTTP requests by status", ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements executed per request", ["route"],
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per request", ["route"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement latency", ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+OUTBOUND_HTTP = Histogram(
+    "outbound_http_duration_seconds", "Latency of calls to external services", ["service", "status"],
+)
+DB_POOL = Gauge("db_pool", "Connection pool state", ["engine", "stat"])
+MEMBERSHIP = Gauge("membership_filter", "Email membership filter counters", ["stat"])
+ENRICHMENT_JOBS = Gauge("enrichment_jobs", "Enrichment jobs by status", ["status"])
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+# ``labels()`` takes a lock and builds a key on every call; the label sets
+# here are small and fixed, so resolve each child once.
+_query_children = {}
+_route_children = {}
+
+
+def _query_child(operation: str):
+    child = _query_children.get(operation)
+    if child is None:
+        child = _query_children[operation] = DB_QUERY_DURATION.labels(operation)
+    return child
+
+
+def _route_child(method: str, route: str):
+    children = _route_children.get((method, route))
+    if children is None:
+        children = _route_children[(method, route)] = (
+            REQUEST_LATENCY.labels(method, route),
+            DB_QUERIES_PER_REQUEST.labels(route),
+            DB_TIME_PER_REQUEST.labels(route),
+            {},
+        )
+    return children
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+    _query_child(statement.lstrip()[:6].upper()).observe(elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_engine(engine):
+    """Count and time every statement ``engine`` (a sync Engine) executes."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def observe_outbound(service: str, status: int | str, seconds: float):
+    OUTBOUND_HTTP.labels(service, str(status)).observe(seconds)
+
+
+def record_snapshot(pools: dict, membership: dict, jobs: dict):
+    for name, stats in pools.items():
+        for stat in ("checked_out", "overflow", "utilization", "checkouts", "timeouts",
+                     "wait_seconds_total", "wait_seconds_max"):
+            DB_POOL.labels(name, stat).set(stats[stat])
+    for stat, value in membership.items():
+        MEMBERSHIP.labels(stat).set(value)
+    for status, count in jobs.items():
+        ENRICHMENT_JOBS.labels(status).set(count)
+
+
+def render() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def _thread_profiler():
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+    return Profiler
+
+
+class _Profile:
+    """pyinstrument when installed (async aware), cProfile otherwise.
+
+    Both profile the whole event loop thread, so only one runs at a time.
+    Work a sync endpoint does in the threadpool is recorded by ``thread()``.
+    """
+
+    active = False
+
+    def __init__(self):
+        _Profile.active = True
+        self._threads = []
+        Profiler = _thread_profiler()
+        if Profiler is None:
+            self._pyinstrument = False
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._pyinstrument = True
+            self._profiler = Profiler(async_mode="enabled")
+            self._profiler.start()
+
+    @contextmanager
+    def thread(self):
+        """Profile the calling (threadpool) thread for the duration of the block."""
+        if self._pyinstrument:
+            profiler = _thread_profiler()(async_mode="disabled")
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        self._threads.append(profiler)
+
+    def stop(self):
+        if self._pyinstrument:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        _Profile.active = False
+
+    def dump(self, route: str, elapsed_ms: float):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = f"{int(time.time() * 1000)}-{route.strip('/').replace('/', '_') or 'root'}-{elapsed_ms:.0f}ms"
+        if self._pyinstrument:
+            for n, profiler in enumerate([self._profiler, *self._threads]):
+                suffix = f"-thread{n}" if n else ""
+                with open(os.path.join(PROFILE_DIR, name + suffix + ".html"), "w") as output:
+                    output.write(profiler.output_html())
+        else:
+            stats = pstats.Stats(self._profiler)
+            for profiler in self._threads:
+                stats.add(profiler)
+            stats.dump_stats(os.path.join(PROFILE_DIR, name + ".prof"))
+
+
+current_profile: ContextVar[_Profile | None] = ContextVar("current_profile", default=None)
+
+
+def profile_in_thread(endpoint):
+    """Wrap a sync endpoint so a sampled request is profiled in its worker thread."""
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        with profile.thread():
+            return endpoint(*args, **kwargs)
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class for routers with sync endpoints, see ``profile_in_thread``."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint):
+            endpoint = profile_in_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so it adds no extra task or body copying."""
+
+    def __init__(self, app, profile_slow_ms: float = PROFILE_SLOW_MS, profile_sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.profile_slow_ms = profile_slow_ms
+        self.profile_sample_rate = profile_sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        profile = profile_token = None
+        if self.profile_slow_ms and not _Profile.active and random.random() < self.profile_sample_rate:
+            profile = _Profile()
+            profile_token = current_profile.set(profile)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            current_request.reset(token)
+
+            method = scope["method"]
+            path = getattr(scope.get("route"), "path", "unmatched")
+            latency, queries, db_time, by_status = _route_child(method, path)
+            latency.observe(elapsed)
+            queries.observe(stats.queries)
+            db_time.observe(stats.db_seconds)
+            counter = by_status.get(status_code)
+            if counter is None:
+                counter = by_status[status_code] = REQUESTS_TOTAL.labels(method, path, str(status_code))
+            counter.inc()
+
+            if profile is not None:
+                current_profile.reset(profile_token)
+                profile.stop()
+                if elapsed * 1000 >= self.profile_slow_ms:
+                    profile.dump(path, elapsed * 1000)
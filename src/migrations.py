@@ -0,0 +1,207 @@
+"""Versioned schema migrations.
+
+``create_all`` only creates missing tables; it never changes a table that
+already exists. Changes to existing tables are written as numbered steps
+here, and ``python -m src.manage migrate`` applies the ones a database has
+not seen yet, recording each in ``schema_version``. A database created from
+the current models with ``create-all`` is stamped with the latest version.
+
+Column changes are written for MySQL (production) and PostgreSQL; SQLite
+cannot alter columns, so SQLite databases are recreated instead.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import Column, Integer, MetaData, Table, delete, func, inspect, select, update
+from sqlalchemy.engine import Connection
+
+import src.models as models
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+@dataclass
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+version_table = Table("schema_version", MetaData(), Column("version", Integer, primary_key=True))
+
+
+def migration(version: int, description: str):
+    def register(upgrade: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, description, upgrade))
+        MIGRATIONS.sort(key=lambda step: step.version)
+        return upgrade
+    return register
+
+
+def head() -> int:
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def current_version(conn: Connection) -> int | None:
+    """Latest applied version, ``None`` if the database was never migrated."""
+    if not inspect(conn).has_table(version_table.name):
+        return None
+    return conn.scalar(select(version_table.c.version).order_by(version_table.c.version.desc()).limit(1)) or 0
+
+
+def pending(conn: Connection) -> list[Migration]:
+    version = current_version(conn) or 0
+    return [step for step in MIGRATIONS if step.version > version]
+
+
+def stamp(conn: Connection, version: int | None = None):
+    version_table.create(conn, checkfirst=True)
+    conn.execute(version_table.delete())
+    conn.execute(version_table.insert().values(version=head() if version is None else version))
+
+
+def upgrade(conn: Connection) -> list[Migration]:
+    """Apply pending migrations in order, each recorded as it completes."""
+    version_table.create(conn, checkfirst=True)
+    applied = []
+    for step in pending(conn):
+        step.upgrade(conn)
+        conn.execute(version_table.delete())
+        conn.execute(version_table.insert().values(version=step.version))
+        applied.append(step)
+    return applied
+
+
+def alter_column_statements(dialect, column: Column) -> list[str]:
+    """DDL that gives an existing column the type, nullability and server default of ``column``."""
+    table = dialect.identifier_preparer.format_table(column.table)
+    name = dialect.identifier_preparer.format_column(column)
+    default = ""
+    if column.server_default is not None:
+        default = " DEFAULT " + str(column.server_default.arg.compile(dialect=dialect))
+
+    if dialect.name == "mysql":
+        null = "NULL" if column.nullable else "NOT NULL"
+        return [f"ALTER TABLE {table} MODIFY {name} {column.type.compile(dialect=dialect)} {null}{default}"]
+    if dialect.name == "postgresql":
+        null = "DROP NOT NULL" if column.nullable else "SET NOT NULL"
+        statements = [f"ALTER TABLE {table} ALTER COLUMN {name} {null}"]
+        if default:
+            statements.append(f"ALTER TABLE {table} ALTER COLUMN {name} SET{default}")
+        return statements
+    raise MigrationError(
+        f"Cannot alter {column.table.name}.{column.name} on {dialect.name}; "
+        "recreate the database with `python -m src.manage create-all`"
+    )
+
+
+def _column_matches(conn: Connection, column: Column) -> bool:
+    live = {c["name"]: c for c in inspect(conn).get_columns(column.table.name)}[column.name]
+    has_default = column.server_default is None or live.get("default") is not None
+    return live["nullable"] == column.nullable and has_default
+
+
+def alter_column(conn: Connection, column: Column):
+    """Apply ``alter_column_statements`` unless the live column already matches."""
+    if _column_matches(conn, column):
+        return
+    for statement in alter_column_statements(conn.dialect, column):
+        conn.exec_driver_sql(statement)
+
+
+def drift(conn: Connection) -> list[str]:
+    """Differences between the models and the live schema, as readable lines."""
+    inspector = inspect(conn)
+    problems = []
+    for table in models.Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"missing table {table.name}")
+            continue
+
+        columns = {column["name"]: column for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            live = columns.get(column.name)
+            if live is None:
+                problems.append(f"missing column {table.name}.{column.name}")
+            elif live["nullable"] != column.nullable and not column.primary_key:
+                expected = "NULL" if column.nullable else "NOT NULL"
+                problems.append(f"column {table.name}.{column.name} should be {expected}")
+            elif column.server_default is not None and live.get("default") is None:
+                problems.append(f"column {table.name}.{column.name} has no server default")
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                problems.append(f"missing index {index.name} on {table.name}")
+    return problems
+
+
+@migration(1, "baseline: schema of the first release")
+def _baseline(conn: Connection):
+    pass
+
+
+@migration(2, "user-002: optional photo and job/education dates, updated_at default")
+def _enrichment_columns(conn: Connection):
+    for column in (
+        models.User.__table__.c.photo_url,
+        models.User.__table__.c.updated_at,
+        models.Job.__table__.c.start_year,
+        models.Job.__table__.c.end_year,
+        models.Education.__table__.c.start_year,
+        models.Education.__table__.c.end_year,
+    ):
+        alter_column(conn, column)
+
+
+@migration(3, "user-006: directory listing and job/education user_id indexes")
+def _directory_indexes(conn: Connection):
+    for index in (
+        *models.User.__table__.indexes,
+        *models.Job.__table__.indexes,
+        *models.Education.__table__.indexes,
+    ):
+        index.create(conn, checkfirst=True)
+
+
+@migration(4, "user-004: store emails normalized (trimmed, lowercase)")
+def _normalize_emails(conn: Connection):
+    # Lookups normalize the email before an exact match, so stored mixed-case
+    # emails would never be found again.
+    user = models.User.__table__
+    normalized = func.lower(func.trim(user.c.email))
+    clashes = conn.execute(
+        select(normalized).group_by(normalized).having(func.count() > 1)
+    ).scalars().all()
+    if clashes:
+        raise MigrationError(
+            f"{len(clashes)} emails differ only by case or whitespace, e.g. {clashes[0]!r}; "
+            "merge those users before migrating"
+        )
+    # No ``WHERE email != lower(trim(email))``: under MySQL's case-insensitive
+    # collations that comparison is false for every row.
+    conn.execute(update(user).values(email=normalized))
+
+
+@migration(5, "user-002: unique round.stage")
+def _unique_round_stage(conn: Connection):
+    # Concurrent ingests could create the same stage twice; keep the oldest
+    # row and point its duplicates' users at it.
+    round_table, user = models.Round.__table__, models.User.__table__
+    duplicated = conn.execute(
+        select(round_table.c.stage, func.min(round_table.c.id))
+        .group_by(round_table.c.stage)
+        .having(func.count() > 1)
+    ).all()
+    for stage, keep in duplicated:
+        extra = conn.execute(
+            select(round_table.c.id).where(round_table.c.stage == stage, round_table.c.id != keep)
+        ).scalars().all()
+        conn.execute(update(user).where(user.c.round_id.in_(extra)).values(round_id=keep))
+        conn.execute(delete(round_table).where(round_table.c.id.in_(extra)))
+    for index in round_table.indexes:
+        index.create(conn, checkfirst=True)
@@ -1,6 +1,6 @@
-from sqlalchemy import Table, Column, ForeignKey
+from sqlalchemy import Table, Column, ForeignKey, Index
 from sqlalchemy.sql.sqltypes import Integer, String, Boolean, DateTime
-from src.database import engine, Base
+from src.database import Base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -13,6 +13,10 @@ class Round(Base):
 
     user = relationship("User", back_populates="stage_round")
 
+    __table_args__ = (
+        Index("ix_round_stage", "stage", unique=True),
+    )
+
 class User(Base):
     __tablename__ = "user"
     id = Column(Integer, primary_key= True)
@@ -23,9 +27,9 @@ class User(Base):
     linkedin_url = Column(String(255), nullable=False, unique=True)
     location = Column(String(255), nullable=True)
     seeking_capital = Column(Boolean, nullable=False, default=False)
-    photo_url = Column(String(255), nullable=False, unique=True)
+    photo_url = Column(String(255), nullable=True, unique=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
-    updated_at = Column(DateTime, nullable=False, onupdate=func.now())
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True)
     is_active = Column(Boolean, nullable= False, default=True)
 
@@ -35,6 +39,14 @@ class User(Base):
     education = relationship("Education", back_populates="user")
     job = relationship("Job", back_populates="user")
 
+    # Directory listing: filter, then walk followers_amount DESC, id DESC.
+    __table_args__ = (
+        Index("ix_user_followers", "followers_amount", "id"),
+        Index("ix_user_round_followers", "round_id", "followers_amount", "id"),
+        Index("ix_user_seeking_followers", "seeking_capital", "followers_amount", "id"),
+        Index("ix_user_location", "location"),
+    )
+
 
 class Education(Base):
     __tablename__ = "education"
@@ -43,10 +55,10 @@ class Education(Base):
     school_name = Column(String(200), nullable= False)
     url_school_logo = Column(String(255), nullable=False)
     linkedin_url = Column(String(255), nullable=False)
-    start_year = Column(DateTime, nullable=False)
-    end_year = Column(DateTime, nullable=False)
+    start_year = Column(DateTime, nullable=True)
+    end_year = Column(DateTime, nullable=True)
     
-    user_id = Column(Integer, ForeignKey("user.id"))
+    user_id = Column(Integer, ForeignKey("user.id"), index=True)
     user = relationship("User", back_populates="education")
 
 class Job(Base):
@@ -61,13 +73,12 @@ class Job(Base):
     linkedin_url = Column(String(255), nullable=False)
     current = Column(Boolean, nullable= False)
     role = Column(String(200), nullable=False)
-    start_year = Column(DateTime, nullable=False)
-    end_year = Column(DateTime, nullable=False)
+    start_year = Column(DateTime, nullable=True)
+    end_year = Column(DateTime, nullable=True)
     
-    user_id = Column(Integer, ForeignKey("user.id"))
+    user_id = Column(Integer, ForeignKey("user.id"), index=True)
     user = relationship("User", back_populates="job")
 
-
-Base.metadata.create_all(bind=engine)
-
-
+    __table_args__ = (
+        Index("ix_job_industry_user", "industry", "user_id"),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import src.models as models
+from src.users.constants import VALIDATE_CHUNK_SIZE
+from src.users.crud import users_query
+from src.users.ingest import round_lookup
+from src.users.linkedin_data import normalize_email
+
+
+async def email_exists(db: AsyncSession, email: str) -> bool:
+    return await db.scalar(select(exists().where(models.User.email == email)))
+
+
+async def existing_emails(db: AsyncSession, emails: list[str], chunk_size: int = VALIDATE_CHUNK_SIZE) -> set[str]:
+    found = set()
+    for start in range(0, len(emails), chunk_size):
+        chunk = emails[start:start + chunk_size]
+        rows = await db.scalars(select(models.User.email).where(models.User.email.in_(chunk)))
+        found.update(map(normalize_email, rows))
+    return found
+
+
+async def list_users(db: AsyncSession, limit: int, after: tuple[int, int] | None = None, **filters) -> list[models.User]:
+    return list(await db.scalars(users_query(after=after, **filters).limit(limit)))
+
+
+async def find_round(db: AsyncSession, stage: str) -> int | None:
+    return await db.run_sync(round_lookup.find, stage)
+
@@ -0,0 +1,80 @@
+"""Async variants of the routes in ``src.users.router``.
+
+Mounted instead of the sync router when ``DB_ASYNC`` is set; every query
+goes through ``AsyncSession`` so requests never wait on the threadpool.
+"""
+import binascii
+
+from fastapi import APIRouter, status, Depends, Query, Request
+from fastapi.responses import JSONResponse
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_async_read_db
+
+from src.users.schemas import ValidUserReq, BulkValidateRes, UserPage
+from src.users import async_crud
+from src.users.linkedin_data import normalize_email
+from src.users.membership import membership
+from src.users.utils import request_emails, validate_emails, encode_cursor, decode_cursor
+
+
+user = APIRouter()
+
+
+@user.post("/user/validate", tags=["users"])
+async def user_validate(valid_user_req: ValidUserReq, db: AsyncSession = Depends(get_async_read_db)) -> dict:
+
+    email = normalize_email(valid_user_req.email)
+    response: bool = await membership.lookup_async(email, lambda key: async_crud.email_exists(db, key))
+
+    return JSONResponse(content={"response": response}, status_code=status.HTTP_200_OK)
+
+
+@user.post("/users/validate/bulk", tags=["users"], response_model=BulkValidateRes)
+async def users_validate_bulk(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+
+    async def existing(keys: set[str]) -> set[str]:
+        return await membership.lookup_many_async(keys, lambda chunk: async_crud.existing_emails(db, chunk))
+
+    try:
+        results = await validate_emails(request_emails(request), existing)
+    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+        return JSONResponse(content={"error": f"Invalid request body: {exc}"}, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    return JSONResponse(content={"results": results}, status_code=status.HTTP_200_OK)
+
+
+@user.get("/users", tags=["users"], response_model=UserPage)
+async def users_list(
+    stage: str | None = None,
+    seeking_capital: bool | None = None,
+    location: str | None = None,
+    industry: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except (ValueError, TypeError, binascii.Error):
+        return JSONResponse(content={"error": "Invalid cursor"}, status_code=status.HTTP_400_BAD_REQUEST)
+
+    round_id = None
+    if stage:
+        round_id = await async_crud.find_round(db, stage)
+        if round_id is None:
+            return UserPage(items=[])
+
+    users = await async_crud.list_users(
+        db,
+        limit + 1,
+        after,
+        round_id=round_id,
+        seeking_capital=seeking_capital,
+        location=location,
+        industry=industry,
+    )
+    next_cursor = encode_cursor(users[limit - 1]) if len(users) > limit else None
+
+    return {"items": users[:limit], "next_cursor": next_cursor}
@@ -1,9 +1,75 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.orm import Session, selectinload
 
 import src.models as models
+from src.users.constants import VALIDATE_CHUNK_SIZE
+from src.users.linkedin_data import normalize_email
 
 
 
-def get_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+def email_exists(db: Session, email: str) -> bool:
+    return db.scalar(select(exists().where(models.User.email == email)))
 
+
+def existing_emails(db: Session, emails: list[str], chunk_size: int = VALIDATE_CHUNK_SIZE) -> set[str]:
+    """Return the subset of ``emails`` that belong to a user.
+
+    Runs one ``SELECT email ... WHERE email IN (...)`` per chunk, answered from
+    the ``ix_user_email`` index without building ORM objects. Returned emails
+    are normalized, since a case-insensitive collation can match a stored
+    value that differs in case from the key.
+    """
+    found = set()
+    for start in range(0, len(emails), chunk_size):
+        chunk = emails[start:start + chunk_size]
+        found.update(map(normalize_email, db.scalars(select(models.User.email).where(models.User.email.in_(chunk)))))
+    return found
+
+
+def users_query(
+    *,
+    round_id: int | None = None,
+    seeking_capital: bool | None = None,
+    location: str | None = None,
+    industry: str | None = None,
+    after: tuple[int, int] | None = None,
+):
+    """Directory listing of active users, most followed first.
+
+    ``after`` is a ``(followers_amount, id)`` keyset cursor: only users that
+    sort after it in that order are returned.
+    """
+    query = (
+        select(models.User)
+        .where(models.User.is_active.is_(True), models.User.deleted_at.is_(None))
+        .options(
+            selectinload(models.User.stage_round),
+            selectinload(models.User.education),
+            selectinload(models.User.job),
+        )
+        .order_by(models.User.followers_amount.desc(), models.User.id.desc())
+    )
+    if round_id is not None:
+        query = query.where(models.User.round_id == round_id)
+    if seeking_capital is not None:
+        query = query.where(models.User.seeking_capital.is_(seeking_capital))
+    if location:
+        query = query.where(models.User.location.startswith(location, autoescape=True))
+    if industry:
+        query = query.where(
+            exists().where(models.Job.user_id == models.User.id, models.Job.industry == industry)
+        )
+    if after is not None:
+        followers_amount, user_id = after
+        query = query.where(
+            or_(
+                models.User.followers_amount < followers_amount,
+                and_(models.User.followers_amount == followers_amount, models.User.id < user_id),
+            )
+        )
+    return query
+
+
+def list_users(db: Session, limit: int, after: tuple[int, int] | None = None, **filters) -> list[models.User]:
+    """Return up to ``limit`` users following the ``(followers_amount, id)`` key ``after``."""
+    return list(db.scalars(users_query(after=after, **filters).limit(limit)))
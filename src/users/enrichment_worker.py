@@ -0,0 +1,168 @@
+"""Worker pool that drains the enrichment queue in the background."""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.database import SessionLocal
+from src.users.constants import (
+    ENRICH_WORKERS,
+    ENRICH_RATE_PER_SEC,
+    ENRICH_BURST,
+    ENRICH_PROCESSES,
+    ENRICH_MAX_ATTEMPTS,
+    ENRICH_RETRY_BACKOFF,
+    ENRICH_MAX_RETRY_DELAY,
+    ENRICH_LEASE_SECONDS,
+)
+from src.users.ingest import ingest_user, IngestError
+from src.users.job_queue import EnrichmentJob, JobQueue, DONE, NOT_FOUND, FAILED, enrichment_queue
+from src.users.linkedin_data import get_user_data, EnrichmentError, EnrichmentRateLimited
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Hand out nothing for ``seconds``, e.g. after the upstream said 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def enrich(job: EnrichmentJob) -> tuple[str, int | None]:
+    """Look up and persist one signup; returns the final status and user id."""
+    user_data = await get_user_data(job.email)
+    if user_data is None:
+        return NOT_FOUND, None
+
+    db = SessionLocal()
+    try:
+        db_user = await run_in_threadpool(ingest_user, db, user_data, email=job.email)
+        return DONE, db_user.id
+    finally:
+        db.close()
+
+
+class EnrichmentWorkers:
+    """``concurrency`` workers in this process.
+
+    ``rate`` and ``burst`` are the budget for the whole deployment and are
+    split evenly over ``processes``, since every process that runs workers
+    has its own token bucket.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue = enrichment_queue,
+        handler: Callable[[EnrichmentJob], Awaitable[tuple[str, int | None]]] = enrich,
+        concurrency: int = ENRICH_WORKERS,
+        rate: float = ENRICH_RATE_PER_SEC,
+        burst: int = ENRICH_BURST,
+        max_attempts: int = ENRICH_MAX_ATTEMPTS,
+        retry_backoff: float = ENRICH_RETRY_BACKOFF,
+        max_retry_delay: float = ENRICH_MAX_RETRY_DELAY,
+        processes: int = ENRICH_PROCESSES,
+        lease_seconds: float = ENRICH_LEASE_SECONDS,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.lease_seconds = lease_seconds
+        processes = max(processes, 1)
+        self.limiter = TokenBucket(rate / processes, max(burst // processes, 1)) if rate > 0 else None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        recovered = await self.queue.recover()
+        if recovered:
+            logger.info("Requeued %d interrupted enrichment jobs", recovered)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self):
+        while True:
+            # Wait for a token before claiming: the lease starts at the claim
+            # and is only renewed while the job runs.
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            await self.run(await self.queue.get())
+
+    def retry_delay(self, job: EnrichmentJob, exc: EnrichmentError) -> float:
+        delay = self.retry_backoff * 2 ** (job.attempts - 1)
+        if isinstance(exc, EnrichmentRateLimited):
+            # Slow every worker in the process down, not just this job.
+            delay = max(delay, exc.retry_after or 0)
+        delay = min(delay, self.max_retry_delay)
+        if isinstance(exc, EnrichmentRateLimited) and self.limiter is not None:
+            self.limiter.pause(delay)
+        return delay
+
+    async def _heartbeat(self, job: EnrichmentJob):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self.queue.extend(job.id)
+
+    async def run(self, job: EnrichmentJob):
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self._run(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _run(self, job: EnrichmentJob):
+        try:
+            status, user_id = await self.handler(job)
+        except EnrichmentError as exc:
+            if job.attempts < self.max_attempts:
+                await self.queue.retry(job.id, str(exc), self.retry_delay(job, exc))
+            else:
+                await self.queue.finish(job.id, FAILED, error=str(exc))
+        except IngestError as exc:
+            await self.queue.finish(job.id, FAILED, error=str(exc))
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for the next process to pick up.
+            await asyncio.shield(self.queue.retry(job.id, "interrupted"))
+            raise
+        except Exception as exc:
+            logger.exception("Enrichment job %s failed", job.id)
+            await self.queue.finish(job.id, FAILED, error=str(exc))
+        else:
+            await self.queue.finish(job.id, status, user_id=user_id)
+
+
+enrichment_workers = EnrichmentWorkers()
@@ -0,0 +1,329 @@
+"""Persist ReverseContact enrichment payloads into User/Job/Education rows.
+
+Can also be run as a batch job over a JSONL file of payloads:
+
+    python -m src.users.ingest payloads.jsonl --chunk-size 500
+
+Lines that cannot be ingested are skipped and reported; a run that stops on
+a database error prints the ``--start-line`` to resume from.
+"""
+import argparse
+import json
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Iterable
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import src.models as models
+from src.database import SessionLocal, init_engines
+from src.users.constants import ROUND_MISSING_TTL
+from src.users.linkedin_data import TTLCache, normalize_email
+from src.users.membership import membership
+
+
+class IngestError(ValueError):
+    pass
+
+
+class RoundLookup:
+    """In-process ``stage -> round.id`` table, loaded once per process.
+
+    Shared by concurrent requests and ingests, so the tables are guarded by a
+    lock (held only around the dicts, never across a query). Stages that do
+    not exist are remembered for ``missing_ttl`` seconds, or until this
+    process creates them, so an unknown ``?stage=`` costs one query rather
+    than one per request; a stage created by another process is found once
+    that entry expires. ``round.stage`` is unique, so concurrent creators
+    end up with the same row.
+    """
+
+    def __init__(self, missing_ttl: float = ROUND_MISSING_TTL, missing_size: int = 1000):
+        self._ids: dict[str, int] | None = None
+        self._missing = TTLCache(missing_size, missing_ttl)
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session) -> dict[str, int]:
+        ids = self._ids
+        if ids is None:
+            ids = {r.stage: r.id for r in db.execute(select(models.Round.id, models.Round.stage))}
+            with self._lock:
+                self._ids = ids
+        return ids
+
+    def _remember(self, stage: str, round_id: int):
+        with self._lock:
+            if self._ids is not None:
+                self._ids[stage] = round_id
+            self._missing.pop(stage)
+
+    def _select(self, db: Session, stage: str) -> int | None:
+        return db.scalar(select(models.Round.id).where(models.Round.stage == stage))
+
+    def find(self, db: Session, stage: str) -> int | None:
+        round_id = self._load(db).get(stage)
+        if round_id is not None:
+            return round_id
+        with self._lock:
+            known_missing, _ = self._missing.get(stage)
+        if known_missing:
+            return None
+
+        # Another process may have added the stage since we loaded.
+        round_id = self._select(db, stage)
+        if round_id is None:
+            with self._lock:
+                self._missing.set(stage, True)
+        else:
+            self._remember(stage, round_id)
+        return round_id
+
+    def resolve(self, db: Session, stage: str | None) -> int | None:
+        if not stage:
+            return None
+        round_id = self._load(db).get(stage)
+        if round_id is None:
+            round_id = self._select(db, stage) or self._create(db, stage)
+            self._remember(stage, round_id)
+        return round_id
+
+    def _create(self, db: Session, stage: str) -> int:
+        """Insert ``stage``, or select it if another session inserted it first."""
+        try:
+            with db.begin_nested():
+                stage_round = models.Round(stage=stage)
+                db.add(stage_round)
+        except IntegrityError:
+            return self._select(db, stage)
+        return stage_round.id
+
+    def reset(self):
+        with self._lock:
+            self._ids = None
+            self._missing.clear()
+
+
+round_lookup = RoundLookup()
+
+
+def _date(start_end: dict | None, key: str) -> datetime | None:
+    part = (start_end or {}).get(key) or {}
+    if not part.get("year"):
+        return None
+    return datetime(part["year"], part.get("month") or 1, 1)
+
+
+def user_row(payload: dict) -> dict:
+    person = payload.get("person") or {}
+    email = payload.get("email")
+    if not email:
+        raise IngestError("Payload has no email")
+    if not person.get("linkedInUrl"):
+        raise IngestError(f"Payload for {email} has no LinkedIn profile")
+
+    return {
+        "email": normalize_email(email),
+        "first_name": person.get("firstName") or "",
+        "last_name": person.get("lastName"),
+        "followers_amount": person.get("followerCount") or 0,
+        "linkedin_url": person["linkedInUrl"],
+        "location": person.get("location"),
+        "photo_url": person.get("photoUrl"),
+    }
+
+
+def job_rows(payload: dict) -> list[dict]:
+    positions = ((payload.get("person") or {}).get("positions") or {}).get("positionHistory") or []
+    company = payload.get("company") or {}
+    rows = []
+
+    for position in positions:
+        start_end = position.get("startEndDate")
+        is_current = _date(start_end, "end") is None
+        # Only the current employer comes with firmographics.
+        firm = company if is_current and position.get("companyName") == company.get("name") else {}
+        employees = firm.get("employeeCountRange") or {}
+        rows.append({
+            "name": position.get("companyName") or "",
+            "website_url": firm.get("websiteUrl") or "",
+            "url_logo": position.get("companyLogo") or "",
+            "amount_employees": f"{employees.get('start', '')}-{employees.get('end', '')}" if employees else "",
+            "country": (firm.get("headquarter") or {}).get("country") or "",
+            "industry": firm.get("industry") or "",
+            "linkedin_url": position.get("linkedInUrl") or "",
+            "current": is_current,
+            "role": position.get("title") or "",
+            "start_year": _date(start_end, "start"),
+            "end_year": _date(start_end, "end"),
+        })
+    return rows
+
+
+def education_rows(payload: dict) -> list[dict]:
+    schools = ((payload.get("person") or {}).get("schools") or {}).get("educationHistory") or []
+    rows = []
+
+    for school in schools:
+        start_end = school.get("startEndDate")
+        degree = ", ".join(filter(None, (school.get("degreeName"), school.get("fieldOfStudy"))))
+        rows.append({
+            "degree_name": degree,
+            "school_name": school.get("schoolName") or "",
+            "url_school_logo": school.get("schoolLogo") or "",
+            "linkedin_url": school.get("linkedInUrl") or "",
+            "start_year": _date(start_end, "start"),
+            "end_year": _date(start_end, "end"),
+        })
+    return rows
+
+
+def ingest_payloads(db: Session, payloads: list[dict], stage: str | None = None) -> list[models.User]:
+    """Upsert users for ``payloads`` and replace their jobs/education.
+
+    Everything is written in a single transaction: new users, jobs and
+    education rows each go out as one executemany INSERT, and the old
+    child rows are removed with one DELETE per table.
+    A payload may carry its own ``stage`` key, which overrides ``stage``.
+    """
+    rows = {}
+    for payload in payloads:
+        row = user_row(payload)
+        rows[row["email"]] = (row, payload)
+
+    try:
+        by_email = {
+            u.email: u
+            for u in db.scalars(select(models.User).where(models.User.email.in_(list(rows))))
+        }
+
+        new_rows = []
+        for email, (row, payload) in rows.items():
+            # Without a stage (e.g. re-enrichment) keep the user's current one.
+            row_stage = payload.get("stage", stage)
+            if row_stage:
+                row["round_id"] = round_lookup.resolve(db, row_stage)
+            if "seeking_capital" in payload:
+                row["seeking_capital"] = bool(payload["seeking_capital"])
+
+            db_user = by_email.get(email)
+            if db_user is None:
+                # executemany takes its columns from the first row, so every
+                # new row must carry the same keys or the rest lose theirs.
+                row.setdefault("seeking_capital", False)
+                row.setdefault("round_id", None)
+                new_rows.append(row)
+            else:
+                for key, value in row.items():
+                    setattr(db_user, key, value)
+        db.flush()
+
+        if new_rows:
+            db.execute(insert(models.User.__table__), new_rows)
+            new_emails = [row["email"] for row in new_rows]
+            by_email.update(
+                (u.email, u)
+                for u in db.scalars(select(models.User).where(models.User.email.in_(new_emails)))
+            )
+
+        users = [(by_email[email], payload) for email, (_, payload) in rows.items()]
+        user_ids = [db_user.id for db_user, _ in users]
+        db.execute(delete(models.Job).where(models.Job.user_id.in_(user_ids)))
+        db.execute(delete(models.Education).where(models.Education.user_id.in_(user_ids)))
+
+        jobs, educations = [], []
+        for db_user, payload in users:
+            jobs += [dict(row, user_id=db_user.id) for row in job_rows(payload)]
+            educations += [dict(row, user_id=db_user.id) for row in education_rows(payload)]
+        if jobs:
+            db.execute(insert(models.Job.__table__), jobs)
+        if educations:
+            db.execute(insert(models.Education.__table__), educations)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        round_lookup.reset()
+        raise
+
+    for email in rows:
+        membership.add(email)
+    return [db_user for db_user, _ in users]
+
+
+def ingest_user(db: Session, payload: dict, email: str | None = None, stage: str | None = None) -> models.User:
+    if email:
+        payload = dict(payload, email=email)
+    return ingest_payloads(db, [payload], stage=stage)[0]
+
+
+@dataclass
+class IngestReport:
+    ingested: int = 0
+    # Last line of the last committed chunk; resume with --start-line after it.
+    committed_line: int = 0
+    skipped: list[tuple[int, str]] = field(default_factory=list)
+
+
+def _valid_payloads(lines: Iterable[str], report: IngestReport, start_line: int = 1):
+    """``(line number, payload)`` for each usable line; bad lines go to ``report.skipped``."""
+    for number, line in enumerate(lines, 1):
+        if number < start_line or not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+            user_row(payload)
+        except (ValueError, AttributeError) as exc:
+            report.skipped.append((number, str(exc)))
+            continue
+        yield number, payload
+
+
+def ingest_file(db: Session, path: str, chunk_size: int = 500, stage: str | None = None,
+                start_line: int = 1, report: IngestReport | None = None) -> IngestReport:
+    """Ingest a JSONL file of payloads, committing once per chunk.
+
+    Lines that are not valid JSON or fail ``user_row`` are skipped and listed
+    in the report. Pass a ``report`` to still see progress if a chunk fails.
+    """
+    report = report or IngestReport()
+    with open(path) as lines:
+        payloads = _valid_payloads(lines, report, start_line)
+        while chunk := list(islice(payloads, chunk_size)):
+            ingest_payloads(db, [payload for _, payload in chunk], stage=stage)
+            report.ingested += len(chunk)
+            report.committed_line = chunk[-1][0]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest ReverseContact payloads from a JSONL file")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--stage", default=None)
+    parser.add_argument("--start-line", type=int, default=1, help="resume from this line of the file")
+    args = parser.parse_args()
+
+    init_engines()
+    db = SessionLocal()
+    report = IngestReport()
+    try:
+        ingest_file(db, args.path, chunk_size=args.chunk_size, stage=args.stage,
+                    start_line=args.start_line, report=report)
+    except Exception:
+        print(f"Failed after line {report.committed_line}; rerun with --start-line {report.committed_line + 1}",
+              file=sys.stderr)
+        raise
+    finally:
+        db.close()
+        for number, error in report.skipped:
+            print(f"Skipped line {number}: {error}", file=sys.stderr)
+    print(f"Ingested {report.ingested} payloads, skipped {len(report.skipped)} lines")
+
+
+if __name__ == "__main__":
+    main()
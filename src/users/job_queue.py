@@ -0,0 +1,320 @@
+"""Pluggable queue of pending signup enrichments.
+
+``MemoryJobQueue`` keeps everything in the process and is meant for
+development and tests. ``SQLiteJobQueue`` stores jobs in a SQLite file, so
+queued work survives a restart and several worker processes can share it:
+a claimed job carries a lease that its worker keeps renewing, and only jobs
+whose lease has run out (their process died) are handed out again.
+Both merge a new request for an email that is already queued or running
+into the existing job.
+"""
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+
+from src.users.constants import ENRICH_QUEUE_BACKEND, ENRICH_QUEUE_PATH, ENRICH_POLL_INTERVAL, ENRICH_LEASE_SECONDS
+from src.users.linkedin_data import normalize_email
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+NOT_FOUND = "not_found"
+FAILED = "failed"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+@dataclass
+class EnrichmentJob:
+    id: str
+    email: str
+    status: str = QUEUED
+    attempts: int = 0
+    error: str | None = None
+    user_id: int | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def dict(self) -> dict:
+        return asdict(self)
+
+
+class JobQueue:
+    """Interface shared by the queue backends."""
+
+    async def put(self, email: str) -> EnrichmentJob:
+        raise NotImplementedError
+
+    async def get(self) -> EnrichmentJob:
+        """Wait for the next queued job and mark it running."""
+        raise NotImplementedError
+
+    async def finish(self, job_id: str, status: str, error: str | None = None, user_id: int | None = None):
+        raise NotImplementedError
+
+    async def retry(self, job_id: str, error: str, delay: float = 0):
+        """Queue the job again, claimable no sooner than ``delay`` seconds from now."""
+        raise NotImplementedError
+
+    async def extend(self, job_id: str):
+        """Renew the lease on a running job."""
+
+    async def status(self, job_id: str) -> EnrichmentJob | None:
+        raise NotImplementedError
+
+    async def counts(self) -> dict[str, int]:
+        raise NotImplementedError
+
+    async def recover(self) -> int:
+        """Requeue running jobs whose lease has expired; return how many."""
+        return 0
+
+    def close(self):
+        pass
+
+
+class MemoryJobQueue(JobQueue):
+
+    def __init__(self):
+        self._jobs: dict[str, EnrichmentJob] = {}
+        self._active: dict[str, str] = {}
+        self._pending: asyncio.Queue | None = None
+
+    def _queue(self) -> asyncio.Queue:
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+        return self._pending
+
+    async def put(self, email: str) -> EnrichmentJob:
+        email = normalize_email(email)
+        job_id = self._active.get(email)
+        if job_id is not None:
+            return self._jobs[job_id]
+
+        job = EnrichmentJob(id=uuid.uuid4().hex, email=email)
+        self._jobs[job.id] = job
+        self._active[email] = job.id
+        self._queue().put_nowait(job.id)
+        return job
+
+    async def get(self) -> EnrichmentJob:
+        job = self._jobs[await self._queue().get()]
+        job.status = RUNNING
+        job.attempts += 1
+        job.updated_at = time.time()
+        return job
+
+    async def finish(self, job_id: str, status: str, error: str | None = None, user_id: int | None = None):
+        job = self._jobs[job_id]
+        job.status, job.error, job.user_id = status, error, user_id
+        job.updated_at = time.time()
+        self._active.pop(job.email, None)
+
+    async def retry(self, job_id: str, error: str, delay: float = 0):
+        job = self._jobs[job_id]
+        job.status, job.error = QUEUED, error
+        job.updated_at = time.time()
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._queue().put_nowait, job_id)
+        else:
+            self._queue().put_nowait(job_id)
+
+    async def status(self, job_id: str) -> EnrichmentJob | None:
+        return self._jobs.get(job_id)
+
+    async def counts(self) -> dict[str, int]:
+        return dict(Counter(job.status for job in self._jobs.values()))
+
+
+class SQLiteJobQueue(JobQueue):
+    """Durable queue in a SQLite file.
+
+    Jobs are claimed inside ``BEGIN IMMEDIATE`` transactions, so several
+    processes can drain the same file without handing out a job twice. A
+    claim records the owning process and a ``lease_until`` deadline; a
+    running job is only claimed again once that deadline has passed, and
+    updates from a worker that has lost its lease are ignored.
+    """
+
+    COLUMNS = "id, email, status, attempts, error, user_id, created_at, updated_at"
+    # Added after the first release; _connect adds them to older files.
+    EXTRA_COLUMNS = {"owner": "TEXT", "lease_until": "REAL", "not_before": "REAL"}
+
+    def __init__(
+        self,
+        path: str = ENRICH_QUEUE_PATH,
+        poll_interval: float = ENRICH_POLL_INTERVAL,
+        lease_seconds: float = ENRICH_LEASE_SECONDS,
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._wakeup: asyncio.Event | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS enrichment_job ("
+                "id TEXT PRIMARY KEY, email TEXT NOT NULL, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, error TEXT, user_id INTEGER, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(enrichment_job)")}
+            for column, column_type in self.EXTRA_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE enrichment_job ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_enrichment_job_status ON enrichment_job (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_enrichment_job_email ON enrichment_job (email, status)")
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn, *args):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn, *args)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    async def _call(self, fn, *args):
+        return await asyncio.to_thread(self._run, fn, *args)
+
+    def _event(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    @classmethod
+    def _row(cls, row) -> EnrichmentJob | None:
+        return EnrichmentJob(*row) if row else None
+
+    def _put(self, conn, email: str) -> EnrichmentJob:
+        row = conn.execute(
+            f"SELECT {self.COLUMNS} FROM enrichment_job WHERE email = ? AND status IN (?, ?)",
+            (email, *ACTIVE_STATUSES),
+        ).fetchone()
+        if row:
+            return self._row(row)
+
+        job = EnrichmentJob(id=uuid.uuid4().hex, email=email)
+        conn.execute(
+            f"INSERT INTO enrichment_job ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            tuple(job.dict().values()),
+        )
+        return job
+
+    def _claim(self, conn) -> EnrichmentJob | None:
+        now = time.time()
+        row = conn.execute(
+            f"SELECT {self.COLUMNS} FROM enrichment_job "
+            "WHERE (status = ? AND (not_before IS NULL OR not_before <= ?)) "
+            "OR (status = ? AND lease_until < ?) ORDER BY created_at LIMIT 1",
+            (QUEUED, now, RUNNING, now),
+        ).fetchone()
+        if not row:
+            return None
+        job = self._row(row)
+        job.status, job.attempts, job.updated_at = RUNNING, job.attempts + 1, now
+        conn.execute(
+            "UPDATE enrichment_job SET status = ?, attempts = ?, updated_at = ?, owner = ?, lease_until = ? "
+            "WHERE id = ?",
+            (job.status, job.attempts, job.updated_at, self.owner, now + self.lease_seconds, job.id),
+        )
+        return job
+
+    def _update(self, conn, job_id: str, status: str, error: str | None, user_id: int | None, delay: float = 0):
+        now = time.time()
+        conn.execute(
+            "UPDATE enrichment_job SET status = ?, error = ?, user_id = ?, updated_at = ?, "
+            "owner = NULL, lease_until = NULL, not_before = ? WHERE id = ? AND owner = ?",
+            (status, error, user_id, now, now + delay if delay > 0 else None, job_id, self.owner),
+        )
+
+    def _extend(self, conn, job_id: str):
+        conn.execute(
+            "UPDATE enrichment_job SET lease_until = ? WHERE id = ? AND owner = ? AND status = ?",
+            (time.time() + self.lease_seconds, job_id, self.owner, RUNNING),
+        )
+
+    async def put(self, email: str) -> EnrichmentJob:
+        job = await self._call(self._put, normalize_email(email))
+        self._event().set()
+        return job
+
+    async def get(self) -> EnrichmentJob:
+        wakeup = self._event()
+        while True:
+            job = await self._call(self._claim)
+            if job is not None:
+                return job
+            wakeup.clear()
+            try:
+                # Other processes may enqueue too, so poll even without a wakeup.
+                await asyncio.wait_for(wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def finish(self, job_id: str, status: str, error: str | None = None, user_id: int | None = None):
+        await self._call(self._update, job_id, status, error, user_id)
+
+    async def retry(self, job_id: str, error: str, delay: float = 0):
+        await self._call(self._update, job_id, QUEUED, error, None, delay)
+        self._event().set()
+
+    async def extend(self, job_id: str):
+        await self._call(self._extend, job_id)
+
+    async def status(self, job_id: str) -> EnrichmentJob | None:
+        return await self._call(
+            lambda conn: self._row(
+                conn.execute(f"SELECT {self.COLUMNS} FROM enrichment_job WHERE id = ?", (job_id,)).fetchone()
+            )
+        )
+
+    async def counts(self) -> dict[str, int]:
+        return await self._call(
+            lambda conn: dict(conn.execute("SELECT status, COUNT(*) FROM enrichment_job GROUP BY status").fetchall())
+        )
+
+    async def recover(self) -> int:
+        # Only expired leases: running jobs of live sibling processes keep theirs.
+        return await self._call(
+            lambda conn: conn.execute(
+                "UPDATE enrichment_job SET status = ?, owner = NULL, lease_until = NULL "
+                "WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (QUEUED, RUNNING, time.time()),
+            ).rowcount
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_queue(backend: str = ENRICH_QUEUE_BACKEND) -> JobQueue:
+    if backend == "memory":
+        return MemoryJobQueue()
+    if backend == "sqlite":
+        return SQLiteJobQueue()
+    raise ValueError(f"Unknown enrichment queue backend: {backend}")
+
+
+enrichment_queue = create_queue()
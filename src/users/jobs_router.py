@@ -0,0 +1,26 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from src.users.schemas import ValidUserReq, NewUserRes, EnrichmentJobRes
+from src.users.job_queue import enrichment_queue
+
+
+jobs = APIRouter()
+
+
+@jobs.post("/new/user", tags=["users"], response_model=EnrichmentJobRes, status_code=status.HTTP_202_ACCEPTED)
+async def new_user(new_user: ValidUserReq):
+    """Queue the signup for enrichment; poll ``/jobs/{id}`` for the outcome."""
+    job = await enrichment_queue.put(new_user.email)
+
+    return JSONResponse(content=job.dict(), status_code=status.HTTP_202_ACCEPTED)
+
+
+@jobs.get("/jobs/{job_id}", tags=["users"], response_model=EnrichmentJobRes)
+async def job_status(job_id: str):
+
+    job = await enrichment_queue.status(job_id)
+    if job is None:
+        return JSONResponse(content=NewUserRes(error="Job not found").dict(), status_code=status.HTTP_404_NOT_FOUND)
+
+    return JSONResponse(content=job.dict(), status_code=status.HTTP_200_OK)
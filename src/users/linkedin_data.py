@@ -1,15 +1,208 @@
-import requests
-import json
-from src.users.constants import URL_API, API_KEY
+import asyncio
+import time
+from collections import OrderedDict
 
-def get_user_data(email: str):
+import httpx
 
-    querystring = {f"apikey": {API_KEY}, "email": {email}}
+from src.metrics import observe_outbound
+from src.users.constants import (
+    URL_API,
+    API_KEY,
+    ENRICHMENT_TIMEOUT,
+    ENRICHMENT_CONNECT_TIMEOUT,
+    ENRICHMENT_RETRIES,
+    ENRICHMENT_BACKOFF,
+    ENRICHMENT_MAX_CONNECTIONS,
+    ENRICHMENT_CACHE_SIZE,
+    ENRICHMENT_CACHE_TTL,
+    ENRICHMENT_NEGATIVE_TTL,
+)
 
-    response = requests.request("GET", URL_API, params=querystring)
 
-    json_object = json.loads(response.text)
+# 429 is not retried here: the caller backs off instead of adding load.
+RETRY_STATUS_CODES = {500, 502, 503, 504}
 
-    json_str = json.dumps(json_object, indent=4)
 
-    return json_object
\ No newline at end of file
+class EnrichmentError(Exception):
+    pass
+
+
+class EnrichmentRateLimited(EnrichmentError):
+    """ReverseContact answered 429; ``retry_after`` is its hint in seconds, if any."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class EnrichmentClient:
+    """Async ReverseContact client.
+
+    Lookups are keyed by normalized email and served from a TTL/LRU cache,
+    with a separate negative cache for emails ReverseContact does not know.
+    Concurrent lookups for the same email share a single upstream request.
+    """
+
+    def __init__(
+        self,
+        url: str = URL_API,
+        api_key: str | None = API_KEY,
+        *,
+        timeout: float = ENRICHMENT_TIMEOUT,
+        connect_timeout: float = ENRICHMENT_CONNECT_TIMEOUT,
+        retries: int = ENRICHMENT_RETRIES,
+        backoff: float = ENRICHMENT_BACKOFF,
+        max_connections: int = ENRICHMENT_MAX_CONNECTIONS,
+        cache_size: int = ENRICHMENT_CACHE_SIZE,
+        cache_ttl: float = ENRICHMENT_CACHE_TTL,
+        negative_ttl: float = ENRICHMENT_NEGATIVE_TTL,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.retries = retries
+        self.backoff = backoff
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._cache = TTLCache(cache_size, cache_ttl)
+        self._negative_cache = TTLCache(cache_size, negative_ttl)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.upstream_calls = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, email: str) -> dict | None:
+        """Return the enrichment payload for ``email`` or ``None`` if unknown."""
+        key = normalize_email(email)
+
+        hit, data = self._cache.get(key)
+        if hit:
+            return data
+        hit, _ = self._negative_cache.get(key)
+        if hit:
+            return None
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str) -> dict | None:
+        data = await self._fetch(key)
+        if data is None:
+            self._negative_cache.set(key, None)
+        else:
+            self._cache.set(key, data)
+        return data
+
+    def require_api_key(self):
+        if not self.api_key:
+            raise EnrichmentError("REVERSECONTACT_API_KEY is not set")
+
+    async def _fetch(self, email: str) -> dict | None:
+        self.require_api_key()
+        client = self._get_client()
+        params = {"apikey": self.api_key, "email": email}
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            self.upstream_calls += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(self.url, params=params)
+            except httpx.TransportError as exc:
+                observe_outbound("reversecontact", "error", time.perf_counter() - start)
+                if last_attempt:
+                    raise EnrichmentError(f"ReverseContact request failed: {exc}") from exc
+            else:
+                observe_outbound("reversecontact", response.status_code, time.perf_counter() - start)
+                if response.status_code == 404:
+                    return None
+                if response.status_code == 429:
+                    raise EnrichmentRateLimited("ReverseContact rate limit hit", _retry_after(response))
+                if response.status_code not in RETRY_STATUS_CODES:
+                    if response.status_code >= 400:
+                        raise EnrichmentError(f"ReverseContact returned {response.status_code}")
+                    try:
+                        data = response.json()
+                    except ValueError as exc:
+                        raise EnrichmentError(f"ReverseContact returned an invalid body: {exc}") from exc
+                    if not data.get("success", True):
+                        return None
+                    return data
+                if last_attempt:
+                    raise EnrichmentError(f"ReverseContact returned {response.status_code}")
+
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    def invalidate(self, email: str):
+        key = normalize_email(email)
+        self._cache.pop(key)
+        self._negative_cache.pop(key)
+
+
+enrichment_client = EnrichmentClient()
+
+
+async def get_user_data(email: str) -> dict | None:
+    return await enrichment_client.get(email)
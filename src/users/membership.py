@@ -0,0 +1,329 @@
+"""In-process negative lookup layer for email validation.
+
+A Bloom filter built from the normalized ``user.email`` answers "definitely
+not registered" without an email lookup; anything the filter might contain is confirmed
+against the database, and confirmed hits are kept in a small LRU.
+
+Negatives are answered from memory without a query. Users created through
+this process are added to the filter immediately; users created by any
+other process (sibling API workers, the ingest CLI) are picked up by a
+primary-key range query against the primary every
+``MEMBERSHIP_CATCH_UP_INTERVAL`` seconds. Until then such a user can be
+reported as not registered, so the staleness window for other processes'
+signups is that interval (1s by default).
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Iterable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+
+import src.models as models
+from src import database
+from src.database import SessionLocal
+from src.users.linkedin_data import normalize_email
+from src.users.constants import (
+    MEMBERSHIP_CATCH_UP_INTERVAL,
+    MEMBERSHIP_FILTER_ENABLED,
+    MEMBERSHIP_ERROR_RATE,
+    MEMBERSHIP_LRU_SIZE,
+    MEMBERSHIP_REBUILD_INTERVAL,
+    MEMBERSHIP_SETTLE_SECONDS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float = MEMBERSHIP_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+class EmailMembership:
+    """Answers ``is this email registered?`` with as few queries as possible.
+
+    Until the filter has been built every lookup falls through to the
+    database. Bloom filters cannot forget, so deleted emails stay "maybe
+    present" (and are confirmed against the database) until the next rebuild.
+
+    ``catch_up`` adds users created elsewhere; it is run on a timer, never
+    from a lookup. ``recent(after_id)`` (``recent_async`` for
+    ``catch_up_async``) returns ``(id, email)`` of users with a larger id; it
+    must read the primary, so rows still lagging on a replica are not missed.
+    """
+
+    def __init__(self, enabled: bool = MEMBERSHIP_FILTER_ENABLED, lru_size: int = MEMBERSHIP_LRU_SIZE,
+                 error_rate: float = MEMBERSHIP_ERROR_RATE,
+                 recent: Callable[[int], list[tuple[int, str]]] | None = None,
+                 recent_async: Callable[[int], Awaitable[list[tuple[int, str]]]] | None = None,
+                 settle_seconds: float = MEMBERSHIP_SETTLE_SECONDS):
+        self.enabled = enabled
+        self.error_rate = error_rate
+        self.lru_size = lru_size
+        self.recent = recent or recent_users
+        self.recent_async = recent_async or recent_users_async
+        self.settle_seconds = settle_seconds
+        self._filter: BloomFilter | None = None
+        # Every user with id <= _settled_id is in the filter. Ids above it are
+        # re-read on each catch-up until they have been visible for
+        # settle_seconds, which covers a lower id committing after a higher one.
+        self._settled_id = 0
+        self._tail: deque = deque()
+        self._hits: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: list[str] | None = None
+        self.counters = {
+            "filter_negatives": 0,
+            "lru_hits": 0,
+            "db_lookups": 0,
+            "db_hits": 0,
+            "false_positives": 0,
+            "catch_ups": 0,
+            "rebuilds": 0,
+        }
+
+    def _remember(self, email: str):
+        with self._lock:
+            self._hits[email] = True
+            self._hits.move_to_end(email)
+            if len(self._hits) > self.lru_size:
+                self._hits.popitem(last=False)
+
+    def _cached_hit(self, email: str) -> bool:
+        with self._lock:
+            if email in self._hits:
+                self._hits.move_to_end(email)
+                return True
+        return False
+
+    def might_contain(self, email: str) -> bool:
+        if not self.enabled or self._filter is None:
+            return True
+        return email in self._filter
+
+    def catch_up(self):
+        """Add users created since the filter was built, by any process."""
+        if self._filter is not None:
+            self._add_recent(self.recent(self._settled_id))
+
+    async def catch_up_async(self):
+        """``catch_up`` through ``recent_async``, for ``DB_ASYNC`` deployments."""
+        if self._filter is not None:
+            self._add_recent(await self.recent_async(self._settled_id))
+
+    def _add_recent(self, rows: list[tuple[int, str]]):
+        now = time.monotonic()
+        with self._lock:
+            newest = self._tail[-1][0] if self._tail else self._settled_id
+            for user_id, email in rows:
+                email = normalize_email(email)
+                if email not in self._filter:
+                    self._filter.add(email)
+                if user_id > newest:
+                    self._tail.append((user_id, now))
+                    newest = user_id
+            while self._tail and self._tail[0][1] <= now - self.settle_seconds:
+                self._settled_id = self._tail.popleft()[0]
+        self.counters["catch_ups"] += 1
+
+    def lookup(self, email: str, exists: Callable[[str], bool]) -> bool:
+        answer = self._answer(email)
+        if answer is not None:
+            return answer
+
+        found = exists(email)
+        self._record(email, found)
+        return found
+
+    async def lookup_async(self, email: str, exists: Callable[[str], Awaitable[bool]]) -> bool:
+        answer = self._answer(email)
+        if answer is not None:
+            return answer
+
+        found = await exists(email)
+        self._record(email, found)
+        return found
+
+    def lookup_many(self, emails: Iterable[str], existing: Callable[[list[str]], set[str]]) -> set[str]:
+        found, candidates = self._split(emails)
+        if candidates:
+            found |= self._confirm(candidates, existing(candidates))
+        return found
+
+    async def lookup_many_async(self, emails: Iterable[str],
+                                existing: Callable[[list[str]], Awaitable[set[str]]]) -> set[str]:
+        found, candidates = self._split(emails)
+        if candidates:
+            found |= self._confirm(candidates, await existing(candidates))
+        return found
+
+    def _answer(self, email: str) -> bool | None:
+        """``True``/``False`` when memory can answer, ``None`` if the database must decide."""
+        if not self.enabled:
+            return None
+        if self._cached_hit(email):
+            self.counters["lru_hits"] += 1
+            return True
+        if not self.might_contain(email):
+            self.counters["filter_negatives"] += 1
+            return False
+        return None
+
+    def _split(self, emails: Iterable[str]) -> tuple[set[str], list[str]]:
+        found, candidates = set(), []
+        for email in emails:
+            answer = self._answer(email)
+            if answer is None:
+                candidates.append(email)
+            elif answer:
+                found.add(email)
+        return found, candidates
+
+    def _confirm(self, candidates: list[str], confirmed: set[str]) -> set[str]:
+        for email in candidates:
+            self._record(email, email in confirmed)
+        return confirmed
+
+    def _record(self, email: str, found: bool):
+        self.counters["db_lookups"] += 1
+        if found:
+            self.counters["db_hits"] += 1
+            if self.enabled:
+                self._remember(email)
+        elif self._filter is not None:
+            self.counters["false_positives"] += 1
+
+    def add(self, email: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(email)
+            if self._filter is not None:
+                self._filter.add(email)
+
+    def discard(self, email: str):
+        with self._lock:
+            self._hits.pop(email, None)
+
+    def rebuild(self, db: Session):
+        """Build a fresh filter from ``user.email`` (on the primary) and swap it in."""
+        if not self.enabled:
+            return
+        self._pending = []
+        try:
+            total = db.scalar(select(func.count(models.User.id)))
+            bloom = BloomFilter(int(total * 1.25) + 1000, self.error_rate)
+            max_id = 0
+            query = select(models.User.id, models.User.email).execution_options(yield_per=10000)
+            for user_id, email in db.execute(query):
+                bloom.add(normalize_email(email))
+                max_id = max(max_id, user_id)
+            with self._lock:
+                # Emails registered while the table was being read.
+                for email in self._pending:
+                    bloom.add(email)
+                self._filter = bloom
+                self._hits.clear()
+                self._settled_id = max_id
+                self._tail.clear()
+        finally:
+            self._pending = None
+        self.counters["rebuilds"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "filter_items": self._filter.count if self._filter else 0,
+            "filter_bytes": self._filter.nbytes if self._filter else 0,
+            "lru_items": len(self._hits),
+            **self.counters,
+        }
+
+
+_recent_query = (
+    select(models.User.id, models.User.email)
+    .where(models.User.id > bindparam("after_id"))
+    .order_by(models.User.id)
+)
+
+
+def recent_users(after_id: int) -> list[tuple[int, str]]:
+    # A bare connection: this runs every MEMBERSHIP_CATCH_UP_INTERVAL.
+    with database.engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(_recent_query, {"after_id": after_id})]
+
+
+async def recent_users_async(after_id: int) -> list[tuple[int, str]]:
+    async with database.async_engine.connect() as conn:
+        return [tuple(row) for row in await conn.execute(_recent_query, {"after_id": after_id})]
+
+
+membership = EmailMembership()
+
+
+async def refresh_membership():
+    db = SessionLocal()
+    try:
+        await run_in_threadpool(membership.rebuild, db)
+    finally:
+        db.close()
+
+
+async def refresh_membership_periodically(interval: float = MEMBERSHIP_REBUILD_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_membership()
+        except Exception:
+            logger.exception("Rebuilding the email membership filter failed")
+
+
+async def catch_up_membership():
+    # Async deployments read through the async engine, not the threadpool.
+    if database.async_engine is not None:
+        await membership.catch_up_async()
+    else:
+        await run_in_threadpool(membership.catch_up)
+
+
+async def catch_up_membership_periodically(interval: float = MEMBERSHIP_CATCH_UP_INTERVAL):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await catch_up_membership()
+        except Exception:
+            logger.exception("Catching up the email membership filter failed")
@@ -1,31 +1,88 @@
-from fastapi import APIRouter, status, Depends
+import binascii
+
+from fastapi import APIRouter, status, Depends, Query, Request
 from fastapi.responses import JSONResponse 
+from fastapi.concurrency import run_in_threadpool
 
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.database import get_read_db
+from src.metrics import ProfiledRoute
 
 
-from src.users.schemas import ValidUserReq, User
-from src.users.crud import get_email
-from src.users.linkedin_data import get_user_data
+from src.users.schemas import ValidUserReq, BulkValidateRes, User, UserPage
+from src.users.crud import email_exists, existing_emails, list_users
+from src.users.linkedin_data import normalize_email
+from src.users.ingest import round_lookup
+from src.users.membership import membership
+from src.users.utils import request_emails, validate_emails, encode_cursor, decode_cursor
 
 
-user = APIRouter()
+user = APIRouter(route_class=ProfiledRoute)
 
 
 @user.post("/user/validate", tags=["users"])
-def user_validate(valid_user_req: ValidUserReq, db: Session = Depends(get_db)) -> dict:
+def user_validate(valid_user_req: ValidUserReq, db: Session = Depends(get_read_db)) -> dict:
 
-    response: bool = False
-    print(valid_user_req)
-    if get_email(db, email = valid_user_req.email):
-        response = True
+    email = normalize_email(valid_user_req.email)
+    response: bool = membership.lookup(email, lambda key: email_exists(db, email = key))
 
     return JSONResponse(content={"response": response}, status_code=status.HTTP_200_OK)
 
 
-@user.post("/new/user", tags=["users"])
-def new_user(new_user: ValidUserReq):
+@user.post("/users/validate/bulk", tags=["users"], response_model=BulkValidateRes)
+async def users_validate_bulk(request: Request, db: Session = Depends(get_read_db)):
+    """Check many emails at once.
+
+    Accepts ``{"emails": [...]}`` or an ``application/x-ndjson`` body with one
+    email (or ``{"email": ...}`` object) per line; NDJSON bodies are checked
+    chunk by chunk while they stream in.
+    """
+    async def existing(keys: set[str]) -> set[str]:
+        return await run_in_threadpool(membership.lookup_many, keys, lambda chunk: existing_emails(db, chunk))
+
+    try:
+        results = await validate_emails(request_emails(request), existing)
+    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+        return JSONResponse(content={"error": f"Invalid request body: {exc}"}, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    return JSONResponse(content={"results": results}, status_code=status.HTTP_200_OK)
+
+
+@user.get("/users", tags=["users"], response_model=UserPage)
+def users_list(
+    stage: str | None = None,
+    seeking_capital: bool | None = None,
+    location: str | None = None,
+    industry: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Investor/founder directory, most followed first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to get the next page.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except (ValueError, TypeError, binascii.Error):
+        return JSONResponse(content={"error": "Invalid cursor"}, status_code=status.HTTP_400_BAD_REQUEST)
+
+    round_id = None
+    if stage:
+        round_id = round_lookup.find(db, stage)
+        if round_id is None:
+            return UserPage(items=[])
+
+    users = list_users(
+        db,
+        limit + 1,
+        after,
+        round_id=round_id,
+        seeking_capital=seeking_capital,
+        location=location,
+        industry=industry,
+    )
+    next_cursor = encode_cursor(users[limit - 1]) if len(users) > limit else None
 
-    return JSONResponse(content=get_user_data(new_user.email), status_code=status.HTTP_200_OK)
+    return {"items": users[:limit], "next_cursor": next_cursor}
@@ -14,19 +14,30 @@ class NewUserRes(BaseModel):
     error: str | None = None
 
 
+class EnrichmentJobRes(BaseModel):
+    id: str
+    email: str
+    status: str
+    attempts: int
+    error: str | None = None
+    user_id: int | None = None
+    created_at: float
+    updated_at: float
+
+
 class User(ValidUserReq):
     id: int
     first_name : str
-    last_name : str
+    last_name : str | None = None
     followers_amount : int
     linkedin_url : str
-    location : str
-    photo_url : str
+    location : str | None = None
+    photo_url : str | None = None
     seeking_capital : bool
-    round_id : int
+    round_id : int | None = None
     created_at : datetime
     updated_at : datetime
-    deleted_at : datetime
+    deleted_at : datetime | None = None
     is_active: bool = True
 
     class Config:
@@ -44,14 +55,14 @@ class Job(BaseModel):
     name : str
     website_url : str
     url_logo : str
-    amount_employees : int
+    amount_employees : str
     country : str
     industry : str
     linkedin_url : str
     current : bool
-    rol : str
-    start_year : datetime
-    end_year : datetime
+    role : str
+    start_year : datetime | None = None
+    end_year : datetime | None = None
 
     class Config:
         orm_mode = True
@@ -63,9 +74,28 @@ class Education(BaseModel):
     school_name : str
     url_school_logo : str
     linkedin_url : str
-    start_year : datetime
-    end_year : datetime
+    start_year : datetime | None = None
+    end_year : datetime | None = None
     user_id : int
 
     class Config:
         orm_mode = True
+
+
+class UserDetail(User):
+    stage_round : Round | None = None
+    education : list[Education] = []
+    job : list[Job] = []
+
+
+class UserPage(BaseModel):
+    items : list[UserDetail]
+    next_cursor : str | None = None
+
+
+class BulkValidateReq(BaseModel):
+    emails: list[str]
+
+
+class BulkValidateRes(BaseModel):
+    results: dict[str, bool]
@@ -0,0 +1,64 @@
+import base64
+import json
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import Request
+
+from src.users.constants import VALIDATE_CHUNK_SIZE
+from src.users.linkedin_data import normalize_email
+from src.users.schemas import BulkValidateReq
+
+
+async def ndjson_emails(request: Request) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                item = json.loads(line)
+                yield item["email"] if isinstance(item, dict) else item
+    if buffer.strip():
+        item = json.loads(buffer)
+        yield item["email"] if isinstance(item, dict) else item
+
+
+async def json_emails(request: Request) -> AsyncIterator[str]:
+    for email in BulkValidateReq(**await request.json()).emails:
+        yield email
+
+
+def request_emails(request: Request) -> AsyncIterator[str]:
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        return ndjson_emails(request)
+    return json_emails(request)
+
+
+async def validate_emails(emails: AsyncIterator[str],
+                          existing: Callable[[set[str]], Awaitable[set[str]]]) -> dict[str, bool]:
+    """Map each email to whether it is registered, checking one chunk at a time."""
+    results: dict[str, bool] = {}
+    batch: dict[str, str] = {}
+
+    async def flush():
+        found = await existing(set(batch.values()))
+        results.update((email, key in found) for email, key in batch.items())
+        batch.clear()
+
+    async for email in emails:
+        batch[email] = normalize_email(email)
+        if len(batch) >= VALIDATE_CHUNK_SIZE:
+            await flush()
+    if batch:
+        await flush()
+    return results
+
+
+def encode_cursor(db_user) -> str:
+    key = json.dumps([db_user.followers_amount, db_user.id]).encode()
+    return base64.urlsafe_b64encode(key).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    followers_amount, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return int(followers_amount), int(user_id)
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite file before src.database is imported.
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TMP, 'test.db')}"
+os.environ.setdefault("ENRICH_QUEUE_PATH", os.path.join(TMP, "jobs.db"))
+os.environ.setdefault("REVERSECONTACT_API_KEY", "test-key")
+
+import pytest
+from sqlalchemy import delete
+
+import src.models as models
+from src.database import SessionLocal, create_async_db_engine, init_engines
+from src.manage import create_all
+from src.users.ingest import round_lookup
+
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = init_engines()
+    create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    for model in (models.Job, models.Education, models.User, models.Round):
+        session.execute(delete(model))
+    session.commit()
+    session.close()
+    round_lookup.reset()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_engine(engine):
+    """An aiosqlite engine on the test database, as ``DB_ASYNC`` would create."""
+    async_engine = create_async_db_engine(os.environ["DATABASE_URL"])
+    yield async_engine
+    await async_engine.dispose()
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import src.database as database
+import src.models as models
+import src.users.async_router as async_router
+from src.users.membership import EmailMembership, catch_up_membership
+
+
+pytestmark = pytest.mark.anyio
+
+
+def create_users(db, *emails: str, **extra):
+    db.execute(insert(models.User.__table__), [
+        {"email": email, "first_name": "User", "linkedin_url": f"https://linkedin.com/in/{email}", **extra}
+        for email in emails
+    ])
+    db.commit()
+
+
+@pytest.fixture
+async def client(db, async_engine):
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_async_read_db():
+        async with sessions() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(async_router.user)
+    app.dependency_overrides[database.get_async_read_db] = get_async_read_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_validate(db, client):
+    create_users(db, "a@x.com")
+
+    assert (await client.post("/user/validate", json={"email": " A@x.com"})).json() == {"response": True}
+    assert (await client.post("/user/validate", json={"email": "b@x.com"})).json() == {"response": False}
+    bulk = await client.post("/users/validate/bulk", json={"emails": ["a@x.com", "b@x.com"]})
+    assert bulk.json() == {"results": {"a@x.com": True, "b@x.com": False}}
+
+
+async def test_directory_pages_and_stage_filter(db, client):
+    db.add(models.Round(stage="seed"))
+    db.commit()
+    create_users(db, "a@x.com", "b@x.com", "c@x.com", followers_amount=10)
+
+    first = (await client.get("/users", params={"limit": 2})).json()
+    second = (await client.get("/users", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+    emails = [item["email"] for item in first["items"] + second["items"]]
+
+    assert sorted(emails) == ["a@x.com", "b@x.com", "c@x.com"]
+    assert second["next_cursor"] is None
+    assert (await client.get("/users", params={"stage": "seed"})).json()["items"] == []
+    assert (await client.get("/users", params={"stage": "unknown"})).json()["items"] == []
+
+
+async def test_catch_up_uses_the_async_engine(db, async_engine, monkeypatch):
+    create_users(db, "a@x.com")
+    layer = EmailMembership(enabled=True, recent=lambda after_id: pytest.fail("used the sync engine"))
+    layer.rebuild(db)
+    create_users(db, "b@x.com")
+    monkeypatch.setattr(database, "async_engine", async_engine)
+    monkeypatch.setattr("src.users.membership.membership", layer)
+
+    await catch_up_membership()
+
+    assert layer.might_contain("b@x.com")
+    assert layer.stats()["catch_ups"] == 1
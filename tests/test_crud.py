@@ -0,0 +1,24 @@
+from sqlalchemy import insert
+
+import src.models as models
+from src.users.crud import list_users
+
+
+def test_keyset_pages_cover_directory_once_in_order(db):
+    # Ties on followers_amount are broken by id, so no user is skipped or repeated.
+    db.execute(insert(models.User.__table__), [
+        {"email": f"u{i}@x.com", "first_name": f"u{i}", "linkedin_url": f"https://linkedin.com/in/u{i}",
+         "followers_amount": i % 3}
+        for i in range(10)
+    ])
+    db.commit()
+
+    pages, after = [], None
+    while page := list_users(db, 3, after):
+        pages.append([u.email for u in page])
+        after = (page[-1].followers_amount, page[-1].id)
+
+    everyone = [u.email for u in list_users(db, 100)]
+    assert [email for page in pages for email in page] == everyone
+    assert len(everyone) == 10
+    assert all(len(page) == 3 for page in pages[:-1])
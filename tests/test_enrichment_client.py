@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.users.linkedin_data import EnrichmentClient, EnrichmentError, TTLCache
+
+
+pytestmark = pytest.mark.anyio
+
+PAYLOAD = {"success": True, "email": "a@x.com", "person": {"firstName": "A"}}
+
+
+def client_for(handler, **options) -> tuple[EnrichmentClient, list[httpx.Request]]:
+    calls = []
+
+    async def record(request):
+        calls.append(request)
+        await asyncio.sleep(0)
+        return handler(request)
+
+    client = EnrichmentClient("https://enrich.test", "key", retries=0, backoff=0, **options)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+    return client, calls
+
+
+async def test_concurrent_lookups_share_one_upstream_call():
+    client, calls = client_for(lambda request: httpx.Response(200, json=PAYLOAD))
+
+    results = await asyncio.gather(*(client.get(email) for email in ("a@x.com", "A@X.com", " a@x.com ")))
+    await client.aclose()
+
+    assert results == [PAYLOAD] * 3
+    assert len(calls) == 1 and calls[0].url.params["email"] == "a@x.com"
+
+
+async def test_hits_and_misses_are_cached():
+    client, calls = client_for(
+        lambda request: httpx.Response(404) if "nobody" in str(request.url) else httpx.Response(200, json=PAYLOAD)
+    )
+
+    assert await client.get("a@x.com") == PAYLOAD
+    assert await client.get("A@x.com") == PAYLOAD
+    assert await client.get("nobody@x.com") is None
+    assert await client.get("nobody@x.com") is None
+    await client.aclose()
+
+    assert len(calls) == 2
+
+
+async def test_unsuccessful_payload_is_a_miss():
+    client, calls = client_for(lambda request: httpx.Response(200, json={"success": False}))
+
+    assert await client.get("a@x.com") is None
+    assert await client.get("a@x.com") is None
+    await client.aclose()
+
+    assert len(calls) == 1
+
+
+async def test_expired_entries_are_fetched_again():
+    client, calls = client_for(lambda request: httpx.Response(200, json=PAYLOAD), cache_ttl=0.05)
+
+    await client.get("a@x.com")
+    await asyncio.sleep(0.1)
+    await client.get("a@x.com")
+    await client.aclose()
+
+    assert len(calls) == 2
+
+
+async def test_invalidate_forces_a_fetch():
+    client, calls = client_for(lambda request: httpx.Response(404))
+
+    await client.get("a@x.com")
+    client.invalidate("A@x.com")
+    await client.get("a@x.com")
+    await client.aclose()
+
+    assert len(calls) == 2
+
+
+async def test_non_json_body_is_an_enrichment_error():
+    client, _ = client_for(lambda request: httpx.Response(200, text="<html>gateway</html>"))
+
+    with pytest.raises(EnrichmentError, match="invalid body"):
+        await client.get("a@x.com")
+    await client.aclose()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+    assert len(cache) == 2
@@ -0,0 +1,159 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+import src.models as models
+from src.database import SessionLocal
+from src.users.ingest import (
+    IngestError,
+    RoundLookup,
+    education_rows,
+    ingest_file,
+    ingest_payloads,
+    ingest_user,
+    job_rows,
+    user_row,
+)
+
+
+def payload(email: str, **extra) -> dict:
+    return {
+        "email": email,
+        "person": {"firstName": email.split("@")[0], "linkedInUrl": f"https://linkedin.com/in/{email}"},
+        **extra,
+    }
+
+
+def user(db, email: str) -> models.User:
+    db.expire_all()
+    return db.scalars(select(models.User).where(models.User.email == email)).one()
+
+
+def test_new_users_keep_optional_columns_in_mixed_batch(db):
+    ingest_payloads(db, [payload("c@x.com"), payload("d@x.com", seeking_capital=True)])
+
+    assert user(db, "c@x.com").seeking_capital is False
+    assert user(db, "d@x.com").seeking_capital is True
+
+
+def test_job_rows_attach_firmographics_to_current_employer_only():
+    rows = job_rows({
+        "person": {"positions": {"positionHistory": [
+            {"companyName": "Acme", "title": "Founder", "startEndDate": {"start": {"year": 2020, "month": 3}}},
+            {"companyName": "Old Co", "title": "Engineer",
+             "startEndDate": {"start": {"year": 2015}, "end": {"year": 2019}}},
+        ]}},
+        "company": {"name": "Acme", "industry": "Fintech", "employeeCountRange": {"start": 11, "end": 50}},
+    })
+
+    current, past = rows
+    assert current["current"] is True and current["industry"] == "Fintech"
+    assert current["amount_employees"] == "11-50"
+    assert current["start_year"] == datetime(2020, 3, 1) and current["end_year"] is None
+    assert past["current"] is False and past["industry"] == "" and past["amount_employees"] == ""
+    assert past["end_year"] == datetime(2019, 1, 1)
+
+
+def test_education_rows_join_degree_and_field():
+    rows = education_rows({"person": {"schools": {"educationHistory": [
+        {"schoolName": "MIT", "degreeName": "BSc", "fieldOfStudy": "Physics"},
+        {"schoolName": "Bootcamp"},
+    ]}}})
+
+    assert [row["degree_name"] for row in rows] == ["BSc, Physics", ""]
+    assert rows[1]["start_year"] is None
+
+
+def test_user_row_requires_linkedin_profile():
+    with pytest.raises(IngestError):
+        user_row({"email": "a@x.com", "person": {}})
+
+
+def test_reingest_without_stage_keeps_round(db):
+    ingest_payloads(db, [payload("a@x.com")], stage="Seed")
+    seed_round = user(db, "a@x.com").round_id
+    assert seed_round is not None
+
+    ingest_user(db, payload("other@x.com"), email="a@x.com")
+    assert user(db, "a@x.com").round_id == seed_round
+
+    ingest_payloads(db, [payload("a@x.com", stage="Series A")])
+    assert user(db, "a@x.com").stage_round.stage == "Series A"
+
+
+def test_mixed_batch_with_and_without_stage(db):
+    ingest_payloads(db, [payload("a@x.com"), payload("b@x.com", stage="Seed")])
+
+    assert user(db, "a@x.com").round_id is None
+    assert user(db, "b@x.com").stage_round.stage == "Seed"
+
+
+def test_stage_created_by_another_process_is_reused(db):
+    lookup = RoundLookup()
+    lookup.find(db, "Seed")  # loaded and remembered as missing
+    with SessionLocal() as other:
+        other.add(models.Round(stage="Seed"))
+        other.commit()
+
+    round_id = lookup.resolve(db, "Seed")
+    db.commit()
+
+    assert db.scalars(select(models.Round.id)).all() == [round_id]
+
+
+def test_unique_stage_rejects_a_second_row(db):
+    lookup = RoundLookup()
+    round_id = lookup.resolve(db, "Seed")
+    db.commit()
+
+    # A sibling that loaded before "Seed" existed inserts, hits the unique
+    # index, and selects the existing row instead.
+    sibling = RoundLookup()
+    sibling._ids = {}
+    assert sibling._create(db, "Seed") == round_id
+    db.commit()
+    assert db.scalars(select(models.Round.id)).all() == [round_id]
+
+
+def test_unknown_stage_is_not_queried_on_every_find(db, monkeypatch):
+    lookup = RoundLookup()
+    queries = []
+    select_stage = lookup._select
+    monkeypatch.setattr(lookup, "_select", lambda db, stage: queries.append(stage) or select_stage(db, stage))
+
+    assert lookup.find(db, "Unknown") is None
+    assert lookup.find(db, "Unknown") is None
+    assert queries == ["Unknown"]
+
+    round_id = lookup.resolve(db, "Unknown")
+    assert lookup.find(db, "Unknown") == round_id
+
+
+def test_ingest_file_skips_and_reports_bad_lines(db, tmp_path):
+    path = tmp_path / "payloads.jsonl"
+    path.write_text("\n".join([
+        json.dumps(payload("a@x.com")),
+        json.dumps({"email": "nolink@x.com", "person": {}}),
+        "{not json",
+        "",
+        json.dumps(payload("b@x.com")),
+    ]))
+
+    report = ingest_file(db, str(path), chunk_size=1)
+
+    assert report.ingested == 2 and report.committed_line == 5
+    assert [number for number, _ in report.skipped] == [2, 3]
+    assert "no LinkedIn profile" in report.skipped[0][1]
+    assert user(db, "b@x.com").first_name == "b"
+
+
+def test_ingest_file_resumes_from_start_line(db, tmp_path):
+    path = tmp_path / "payloads.jsonl"
+    path.write_text("\n".join(json.dumps(payload(email)) for email in ("a@x.com", "b@x.com")))
+
+    report = ingest_file(db, str(path), start_line=2)
+
+    assert report.ingested == 1
+    assert db.scalars(select(models.User.email)).all() == ["b@x.com"]
@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.users.enrichment_worker import EnrichmentWorkers
+from src.users.job_queue import DONE, QUEUED, RUNNING, EnrichmentJob, SQLiteJobQueue
+from src.users.linkedin_data import EnrichmentClient, EnrichmentError, EnrichmentRateLimited
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+async def test_recover_leaves_live_siblings_jobs_alone(path):
+    first, second = SQLiteJobQueue(path, lease_seconds=60), SQLiteJobQueue(path, lease_seconds=60)
+    job = await first.put("a@x.com")
+    await first.get()
+
+    assert await second.recover() == 0
+    assert (await second.status(job.id)).status == RUNNING
+
+    await first.finish(job.id, DONE)
+    assert (await second.status(job.id)).status == DONE
+
+
+async def test_expired_lease_is_claimed_again_and_stale_owner_ignored(path):
+    first, second = SQLiteJobQueue(path, lease_seconds=0.05), SQLiteJobQueue(path, lease_seconds=60)
+    job = await first.put("a@x.com")
+    await first.get()
+    await asyncio.sleep(0.1)
+
+    reclaimed = await asyncio.wait_for(second.get(), 1)
+    assert reclaimed.id == job.id and reclaimed.attempts == 2
+
+    await first.retry(job.id, "late")
+    assert (await second.status(job.id)).status == RUNNING
+
+
+async def test_heartbeat_keeps_lease_of_slow_job(path):
+    queue, sibling = SQLiteJobQueue(path, lease_seconds=0.15), SQLiteJobQueue(path, lease_seconds=0.15)
+
+    async def slow(job):
+        await asyncio.sleep(0.5)
+        return DONE, None
+
+    workers = EnrichmentWorkers(queue, slow, concurrency=1, rate=0, lease_seconds=0.15)
+    job = await queue.put("a@x.com")
+    run = asyncio.create_task(workers.run(await queue.get()))
+    await asyncio.sleep(0.3)
+
+    assert await sibling.recover() == 0
+    await run
+    assert (await sibling.status(job.id)).status == DONE
+
+
+def test_rate_is_split_across_processes():
+    workers = EnrichmentWorkers(rate=8, burst=10, processes=4)
+
+    assert workers.limiter.rate == 2
+    assert workers.limiter.burst == 2
+
+
+async def test_retry_delay_holds_job_back(path):
+    queue = SQLiteJobQueue(path, poll_interval=0.02)
+    job = await queue.put("a@x.com")
+    await queue.get()
+    await queue.retry(job.id, "boom", delay=0.3)
+
+    assert (await queue.status(job.id)).status == QUEUED
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(queue.get(), 0.1)
+    assert (await asyncio.wait_for(queue.get(), 1)).id == job.id
+
+
+async def test_rate_limited_job_backs_off_and_pauses_limiter(path):
+    queue = SQLiteJobQueue(path)
+
+    async def limited(job):
+        raise EnrichmentRateLimited("429", retry_after=30)
+
+    workers = EnrichmentWorkers(queue, limited, concurrency=1, rate=100, burst=10, retry_backoff=1)
+    job = await queue.put("a@x.com")
+    await workers.run(await queue.get())
+
+    assert (await queue.status(job.id)).status == QUEUED
+    not_before = await queue._call(lambda conn: conn.execute("SELECT not_before FROM enrichment_job").fetchone()[0])
+    assert not_before > time.time() + 25
+    assert workers.limiter._paused_until > time.monotonic() + 25
+
+
+async def test_client_does_not_retry_429():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "12"})
+
+    client = EnrichmentClient("https://enrich.test", "key", retries=2, backoff=0)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(EnrichmentRateLimited) as exc_info:
+        await client.get("a@x.com")
+    await client.aclose()
+
+    assert len(calls) == 1 and exc_info.value.retry_after == 12
+
+
+async def test_client_without_api_key_fails_before_calling_upstream():
+    calls = []
+    client = EnrichmentClient("https://enrich.test", None)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(calls.append))
+    with pytest.raises(EnrichmentError, match="REVERSECONTACT_API_KEY"):
+        await client.get("a@x.com")
+    await client.aclose()
+
+    assert calls == []
+
+
+async def test_paused_limiter_does_not_let_lease_expire(path):
+    calls = []
+
+    async def handler(job):
+        calls.append(job.id)
+        return DONE, None
+
+    pools = [
+        EnrichmentWorkers(SQLiteJobQueue(path, poll_interval=0.02, lease_seconds=0.2), handler,
+                          concurrency=1, rate=100, burst=1, lease_seconds=0.2)
+        for _ in range(2)
+    ]
+    for workers in pools:
+        workers.limiter.pause(0.6)
+    job = await pools[0].queue.put("a@x.com")
+    for workers in pools:
+        await workers.start()
+    try:
+        await asyncio.sleep(1)
+    finally:
+        for workers in pools:
+            await workers.stop()
+
+    assert calls == [job.id]
+    assert (await pools[0].queue.status(job.id)).status == DONE
+
+
+def test_retry_after_is_capped():
+    workers = EnrichmentWorkers(rate=100, retry_backoff=1, max_retry_delay=60)
+    job = EnrichmentJob("1", "a@x.com", attempts=1)
+
+    assert workers.retry_delay(job, EnrichmentRateLimited("429", retry_after=86400)) == 60
+    assert workers.limiter._paused_until < time.monotonic() + 61
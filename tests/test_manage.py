@@ -0,0 +1,148 @@
+import pytest
+from sqlalchemy import MetaData, String, insert, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import mysql
+
+import src.models as models
+from src import migrations
+from src.database import create_db_engine
+from src.manage import check, create_all, migrate
+from src.users.crud import existing_emails
+
+
+@pytest.fixture
+def scratch(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'scratch.db'}")
+    yield engine
+    engine.dispose()
+
+
+def create_case_insensitive(engine):
+    """The models, with ``user.email`` compared case-insensitively as on MySQL."""
+    metadata = MetaData()
+    for table in models.Base.metadata.sorted_tables:
+        table.to_metadata(metadata)
+    metadata.tables["user"].c.email.type = String(200, collation="NOCASE")
+    metadata.create_all(engine)
+
+
+def test_create_all_stamps_fresh_database(scratch):
+    create_all(scratch)
+
+    assert check(scratch) == []
+    with scratch.connect() as conn:
+        assert migrations.current_version(conn) == migrations.head()
+
+
+def test_check_reports_unmigrated_database_and_drift(scratch):
+    models.Base.metadata.create_all(scratch)
+    with scratch.begin() as conn:
+        conn.execute(text("DROP INDEX ix_user_location"))
+        conn.execute(text("ALTER TABLE job DROP COLUMN country"))
+
+    problems = check(scratch)
+
+    assert "pending migration 1: baseline: schema of the first release" in problems
+    assert "missing index ix_user_location on user" in problems
+    assert "missing column job.country" in problems
+
+
+def test_migrate_records_each_step(scratch):
+    models.Base.metadata.create_all(scratch)
+
+    applied = migrate(scratch)
+
+    assert [step.version for step in applied] == [step.version for step in migrations.MIGRATIONS]
+    assert migrate(scratch) == []
+    assert check(scratch) == []
+
+
+def test_alter_column_statements_for_mysql():
+    dialect = mysql.dialect()
+
+    assert migrations.alter_column_statements(dialect, models.User.__table__.c.photo_url) == [
+        "ALTER TABLE user MODIFY photo_url VARCHAR(255) NULL"
+    ]
+    assert migrations.alter_column_statements(dialect, models.User.__table__.c.updated_at) == [
+        "ALTER TABLE user MODIFY updated_at DATETIME NOT NULL DEFAULT now()"
+    ]
+
+
+def test_alter_column_statements_refuse_sqlite(scratch):
+    with pytest.raises(migrations.MigrationError):
+        migrations.alter_column_statements(scratch.dialect, models.Job.__table__.c.start_year)
+
+
+def test_migrate_creates_missing_indexes(scratch):
+    create_all(scratch)
+    with scratch.begin() as conn:
+        for index in ("ix_user_followers", "ix_user_round_followers", "ix_job_industry_user", "ix_education_user_id"):
+            conn.execute(text(f"DROP INDEX {index}"))
+        migrations.stamp(conn, 2)
+
+    assert 3 in [step.version for step in migrate(scratch)]
+    assert check(scratch) == []
+
+
+def test_migrate_normalizes_stored_emails(scratch):
+    create_all(scratch)
+    with scratch.begin() as conn:
+        conn.execute(insert(models.User.__table__), [
+            {"email": " Mixed.Case@Example.com", "first_name": "A", "linkedin_url": "https://linkedin.com/in/a"},
+            {"email": "lower@example.com", "first_name": "B", "linkedin_url": "https://linkedin.com/in/b"},
+        ])
+        migrations.stamp(conn, 3)
+
+    migrate(scratch)
+
+    with scratch.connect() as conn:
+        emails = set(conn.scalars(select(models.User.email)))
+    assert emails == {"mixed.case@example.com", "lower@example.com"}
+
+
+def test_email_normalization_refuses_case_duplicates(scratch):
+    create_all(scratch)
+    with scratch.begin() as conn:
+        conn.execute(insert(models.User.__table__), [
+            {"email": "Dup@example.com", "first_name": "A", "linkedin_url": "https://linkedin.com/in/a"},
+            {"email": "dup@example.com", "first_name": "B", "linkedin_url": "https://linkedin.com/in/b"},
+        ])
+        migrations.stamp(conn, 3)
+
+    with pytest.raises(migrations.MigrationError):
+        migrate(scratch)
+
+
+def test_email_normalization_under_case_insensitive_collation(scratch):
+    create_case_insensitive(scratch)
+    with scratch.begin() as conn:
+        conn.execute(insert(models.User.__table__), [
+            {"email": "Mixed@Example.com", "first_name": "A", "linkedin_url": "https://linkedin.com/in/a"},
+        ])
+        migrations.stamp(conn, 3)
+
+    with Session(scratch) as db:
+        assert existing_emails(db, ["mixed@example.com"]) == {"mixed@example.com"}
+
+    migrate(scratch)
+
+    with scratch.connect() as conn:
+        assert conn.scalar(text("SELECT email FROM user")) == "mixed@example.com"
+
+
+def test_migrate_merges_duplicate_stages_and_makes_stage_unique(scratch):
+    create_all(scratch)
+    with scratch.begin() as conn:
+        conn.execute(text("DROP INDEX ix_round_stage"))
+        conn.execute(insert(models.Round.__table__), [{"id": 1, "stage": "Seed"}, {"id": 2, "stage": "Seed"}])
+        conn.execute(insert(models.User.__table__), [
+            {"email": "a@x.com", "first_name": "A", "linkedin_url": "https://linkedin.com/in/a", "round_id": 2},
+        ])
+        migrations.stamp(conn, 4)
+
+    migrate(scratch)
+
+    with scratch.connect() as conn:
+        assert conn.execute(select(models.Round.id, models.Round.stage)).all() == [(1, "Seed")]
+        assert conn.scalar(select(models.User.round_id)) == 1
+    assert check(scratch) == []
@@ -0,0 +1,68 @@
+from sqlalchemy import insert
+
+import src.models as models
+from src.users.crud import email_exists, existing_emails
+from src.users.membership import EmailMembership
+
+
+def create_user(db, email: str, **extra):
+    db.execute(insert(models.User.__table__), [{
+        "email": email, "first_name": "User", "linkedin_url": f"https://linkedin.com/in/{email}", **extra,
+    }])
+    db.commit()
+
+
+def built_filter(db) -> EmailMembership:
+    layer = EmailMembership(enabled=True)
+    layer.rebuild(db)
+    return layer
+
+
+def test_user_created_by_another_process_is_found_after_catch_up(db):
+    create_user(db, "old@x.com")
+    layer = built_filter(db)
+    create_user(db, "new@x.com")  # not through layer.add, as in a sibling worker
+    layer.catch_up()  # the periodic tick
+
+    assert layer.lookup("new@x.com", lambda email: email_exists(db, email)) is True
+    assert layer.lookup_many(["new@x.com", "nobody@x.com"], lambda chunk: existing_emails(db, chunk)) == {"new@x.com"}
+    assert layer.lookup("nobody@x.com", lambda email: email_exists(db, email)) is False
+
+
+def test_lower_id_committed_late_is_still_caught_up(db):
+    create_user(db, "a@x.com", id=1)
+    layer = built_filter(db)
+    create_user(db, "c@x.com", id=3)
+    layer.catch_up()
+
+    create_user(db, "b@x.com", id=2)  # committed after a higher id was seen
+    layer.catch_up()
+    assert layer.lookup("b@x.com", lambda email: email_exists(db, email)) is True
+
+
+def test_negatives_are_answered_from_memory(db):
+    create_user(db, "a@x.com")
+    caught_up = []
+    layer = EmailMembership(enabled=True, recent=lambda after_id: caught_up.append(after_id) or [])
+    layer.rebuild(db)
+
+    def exists(email):
+        raise AssertionError("filter negative went to the email lookup")
+
+    def existing(emails):
+        raise AssertionError("filter negatives went to the email lookup")
+
+    assert layer.lookup("nobody@x.com", exists) is False
+    assert layer.lookup_many(["nobody@x.com", "none@x.com"], existing) == set()
+    assert layer.stats()["filter_negatives"] == 3
+    assert caught_up == []  # no catch-up query on the lookup path
+
+
+def test_filter_is_built_from_normalized_emails(db):
+    create_user(db, "Mixed@Example.com")
+    layer = built_filter(db)
+    create_user(db, "Late.Mixed@Example.com")
+    layer.catch_up()
+
+    assert layer.might_contain("mixed@example.com")
+    assert layer.might_contain("late.mixed@example.com")
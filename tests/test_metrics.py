@@ -0,0 +1,48 @@
+import pstats
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+import src.metrics as metrics
+
+
+def busy_sync_handler():
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+    return {"ok": True}
+
+
+def test_sync_endpoint_work_is_in_the_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "PROFILE_DIR", str(tmp_path))
+    router = APIRouter(route_class=metrics.ProfiledRoute)
+    router.get("/busy")(busy_sync_handler)
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(metrics.MetricsMiddleware, profile_slow_ms=1, profile_sample_rate=1)
+
+    with TestClient(app) as client:
+        assert client.get("/busy").json() == {"ok": True}
+
+    [dump] = tmp_path.glob("*.prof")
+    functions = {name for _, _, name in pstats.Stats(str(dump)).stats}
+    assert "busy_sync_handler" in functions
+
+
+def test_request_metrics_use_route_template():
+    router = APIRouter(route_class=metrics.ProfiledRoute)
+
+    @router.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    with TestClient(app) as client:
+        assert client.get("/items/7").json() == {"id": 7}
+
+    body, _ = metrics.render()
+    assert b'http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in body
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+import src.models as models
+import src.users.router as router
+import src.users.utils as utils
+
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+@pytest.fixture
+def client(db):
+    db.execute(insert(models.User.__table__), [
+        {"email": email, "first_name": "User", "linkedin_url": f"https://linkedin.com/in/{email}"}
+        for email in ("a@x.com", "b@x.com")
+    ])
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(router.user)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    """Record the emails looked up per flush, with two emails per chunk."""
+    seen = []
+    existing_emails = router.existing_emails
+
+    def recording(db, emails):
+        seen.append(sorted(emails))
+        return existing_emails(db, emails)
+
+    monkeypatch.setattr(utils, "VALIDATE_CHUNK_SIZE", 2)
+    monkeypatch.setattr(router, "existing_emails", recording)
+    return seen
+
+
+def test_json_body(client):
+    response = client.post("/users/validate/bulk", json={"emails": ["a@x.com", " B@X.com ", "c@x.com"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"results": {"a@x.com": True, " B@X.com ": True, "c@x.com": False}}
+
+
+def test_ndjson_stream_without_trailing_newline(client):
+    def body():
+        yield b'"a@x.com"\n{"email": "c@x'
+        yield b'.com"}\n\n'
+        yield b'{"email": "b@x.com"}'
+
+    response = client.post("/users/validate/bulk", content=body(), headers=NDJSON)
+
+    assert response.status_code == 200
+    assert response.json() == {"results": {"a@x.com": True, "c@x.com": False, "b@x.com": True}}
+
+
+def test_lookups_flush_per_chunk(client, chunks):
+    emails = ["a@x.com", "b@x.com", "c@x.com", "d@x.com", "e@x.com"]
+    body = "\n".join(json.dumps(email) for email in emails)
+
+    response = client.post("/users/validate/bulk", content=body, headers=NDJSON)
+
+    assert response.status_code == 200
+    assert chunks == [["a@x.com", "b@x.com"], ["c@x.com", "d@x.com"], ["e@x.com"]]
+
+
+@pytest.mark.parametrize("body, headers", [
+    ("not json", {"content-type": "application/json"}),
+    ('{"addresses": ["a@x.com"]}', {"content-type": "application/json"}),
+    ('"a@x.com"\nnot json\n', NDJSON),
+    ('{"mail": "a@x.com"}\n', NDJSON),
+])
+def test_invalid_body_is_422(client, body, headers):
+    response = client.post("/users/validate/bulk", content=body, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["error"].startswith("Invalid request body")